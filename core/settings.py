@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,7 +10,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = os.getenv("SECRET_KEY", "django-insecure-default-key-change-me")
 
-DEBUG = True
+DEBUG = os.getenv("DEBUG", "True") == "True"
 
 ALLOWED_HOSTS = ["*"]
 
@@ -20,12 +21,14 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "crispy_forms",
     "crispy_bootstrap5",
     "education",
 ]
 
 MIDDLEWARE = [
+    "education.middleware.SQLInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -35,8 +38,23 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Подсчёт SQL-запросов на запрос: заголовок Server-Timing и журнал education.sql
+SQL_INSTRUMENTATION = os.getenv("SQL_INSTRUMENTATION", "False") == "True"
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "10"))
+
+# BACKGROUND_JOBS=True: тяжёлые операции ставятся в очередь и выполняются
+# командой run_jobs; иначе задача выполняется сразу в запросе
+BACKGROUND_JOBS = os.getenv("BACKGROUND_JOBS", "False") == "True"
+JOB_RESULTS_DIR = os.getenv("JOB_RESULTS_DIR", str(BASE_DIR / "job_results"))
+
 ROOT_URLCONF = "core.urls"
 
+# Асинхронные версии отчётов и документов; core.asgi включает их по умолчанию
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "False") == "True"
+# Потоков для запросов асинхронных представлений на воркер: не больше
+# одновременно открытых ими соединений с базой
+ASYNC_DB_THREADS = int(os.getenv("ASYNC_DB_THREADS", "4"))
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -55,6 +73,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "core.wsgi.application"
 
+# DB_POOL=True включает пул соединений psycopg; иначе соединения постоянные
+# (CONN_MAX_AGE) с проверкой работоспособности перед повторным использованием
+DB_POOL = os.getenv("DB_POOL", "False") == "True"
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -63,11 +85,59 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": "db",
         "PORT": "5432",
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+if DB_POOL:
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            "timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+        }
+    }
+
+if os.getenv("CACHE_BACKEND") == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL", "redis://redis:6379/0"),
+        }
+    }
+elif os.getenv("CACHE_BACKEND") == "db":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "django_cache",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 AUTH_USER_MODEL = "education.User"
 
+# AUTH_CACHE=True: сессии и пользователь читаются из кеша, без запросов к БД.
+# Кеш должен быть общим для всех воркеров, иначе выход и смена пароля
+# не будут видны в других процессах.
+AUTH_CACHE = os.getenv("AUTH_CACHE", "False") == "True"
+if AUTH_CACHE and os.getenv("CACHE_BACKEND") != "redis":
+    raise ImproperlyConfigured("AUTH_CACHE=True требует CACHE_BACKEND=redis")
+if AUTH_CACHE:
+    SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+AUTH_USER_CACHE_TIMEOUT = (
+    int(os.getenv("AUTH_USER_CACHE_TIMEOUT", "300")) if AUTH_CACHE else 0
+)
+
+# Единственный бэкенд: второй ModelBackend повторял бы проверку пароля при
+# каждом неудачном входе. Сессии со старым путём бэкенда требуют повторного входа
+AUTHENTICATION_BACKENDS = ["education.backends.CachedModelBackend"]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"
@@ -93,3 +163,18 @@ LOGOUT_REDIRECT_URL = "/"
 LOGIN_URL = "/accounts/login/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "education.sql": {
+            "handlers": ["console"],
+            "level": os.getenv("SQL_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
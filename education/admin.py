@@ -1,6 +1,16 @@
 from django.contrib import admin
 
-from .models import Discipline, GradeSheet, Group, Semester, Specialty, Student
+from .models import (
+    Discipline,
+    GradeSheet,
+    Group,
+    Semester,
+    Specialty,
+    Student,
+    Teacher,
+    TeachingAssignment,
+)
+from .services import refresh_semester_summaries
 
 
 @admin.register(Specialty)
@@ -18,6 +28,41 @@ class StudentAdmin(admin.ModelAdmin):
     list_display = ("surname", "first_name", "group")
 
 
+@admin.register(Teacher)
+class TeacherAdmin(admin.ModelAdmin):
+    list_display = ("surname", "first_name", "position", "user")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+
+
 admin.site.register(Semester)
 admin.site.register(Group)
-admin.site.register(GradeSheet)
+
+
+@admin.register(GradeSheet)
+class GradeSheetAdmin(admin.ModelAdmin):
+    list_display = ("student", "discipline", "semester", "grade")
+    list_select_related = ("student", "discipline", "semester")
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # Пересчитываем и прежнюю пару (студент, семестр), если её изменили
+        student_ids = {obj.student_id, form.initial.get("student")} - {None}
+        semester_ids = {obj.semester_id, form.initial.get("semester")} - {None}
+        refresh_semester_summaries(student_ids, semester_ids, prune=True)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        refresh_semester_summaries([obj.student_id], [obj.semester_id], prune=True)
+
+    def delete_queryset(self, request, queryset):
+        student_ids = list(queryset.values_list("student_id", flat=True))
+        semester_ids = list(queryset.values_list("semester_id", flat=True))
+        super().delete_queryset(request, queryset)
+        refresh_semester_summaries(student_ids, semester_ids, prune=True)
+
+
+@admin.register(TeachingAssignment)
+class TeachingAssignmentAdmin(admin.ModelAdmin):
+    list_display = ("discipline", "group", "teacher")
+    list_select_related = ("discipline", "group", "teacher")
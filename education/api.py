@@ -0,0 +1,83 @@
+from django.db.models import Count, Max
+
+from .models import GradeSheet
+
+
+def grades_stamp(sheets, *related):
+    # Число ведомостей и последнее изменение их самих и связанных строк, чьи поля
+    # попадают в ответ. Считается по базе, поэтому одинаков во всех процессах;
+    # удаление не сдвигает MAX, но меняет число
+    fields = ["updated_at", *(f"{name}__updated_at" for name in related)]
+    stamp = sheets.aggregate(Count("id"), *(Max(field) for field in fields))
+    return tuple(stamp.values())
+
+
+def group_discipline_sheets(group_id, discipline_id):
+    return GradeSheet.objects.filter(
+        discipline_id=discipline_id, student__group_id=group_id
+    )
+
+
+def group_discipline_stamp(group_id, discipline_id):
+    return grades_stamp(group_discipline_sheets(group_id, discipline_id), "student")
+
+
+def group_discipline_grades(group_id, discipline_id):
+    return list(
+        group_discipline_sheets(group_id, discipline_id)
+        .order_by("student__surname", "student__first_name", "student_id")
+        .values(
+            "id",
+            "student_id",
+            "student__surname",
+            "student__first_name",
+            "student__patronymic",
+            "grade",
+            "date",
+        )
+    )
+
+
+def student_stamp(student_id):
+    return grades_stamp(
+        GradeSheet.objects.filter(student_id=student_id), "discipline", "semester"
+    )
+
+
+def student_grades(student_id):
+    return list(
+        GradeSheet.objects.filter(student_id=student_id)
+        .order_by("semester__number", "discipline__name")
+        .values(
+            "id",
+            "discipline_id",
+            "discipline__name",
+            "discipline__exam_type",
+            "semester__number",
+            "grade",
+            "date",
+        )
+    )
+
+
+def semester_sheets(semester_number, group_id=None):
+    sheets = GradeSheet.objects.filter(semester__number=semester_number)
+    if group_id is not None:
+        sheets = sheets.filter(student__group_id=group_id)
+    return sheets
+
+
+def semester_stamp(semester_number, group_id=None):
+    return grades_stamp(
+        semester_sheets(semester_number, group_id), "student", "semester"
+    )
+
+
+def semester_grades(semester_number, group_id=None):
+    return list(
+        semester_sheets(semester_number, group_id)
+        .order_by("student__group_id", "student_id", "discipline_id")
+        .values(
+            "id", "student_id", "student__group_id", "discipline_id", "grade", "date"
+        )
+    )
@@ -0,0 +1,134 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import date
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.db import connection, connections
+from django.http import Http404
+from django.shortcuts import render
+
+from .documents import control_forms_data, curriculum_data
+from .middleware import current_stats
+from .models import Student
+from .views import (
+    conditional_page,
+    control_forms_semester,
+    documents_stamp,
+    page_stamp,
+    report_course,
+    report_grades,
+    report_stamp,
+    report_totals,
+)
+
+
+# Потоки создаются по мере надобности, поэтому пул безопасен для --preload
+DB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.ASYNC_DB_THREADS, thread_name_prefix="async-db"
+)
+
+
+def in_worker_thread(func):
+    # Асинхронный ORM выполняет запросы по очереди в одном потоке, поэтому
+    # независимые запросы уходят в потоки ограниченного пула. Соединение
+    # закрывается после каждого вызова (при DB_POOL возвращается в пул),
+    # иначе каждый поток держал бы своё постоянное соединение.
+    # Запросы попадают в счётчик SQLInstrumentationMiddleware
+    def call():
+        stats = current_stats.get()
+        try:
+            with connection.execute_wrapper(stats) if stats else nullcontext():
+                return func()
+        finally:
+            connections.close_all()
+
+    return sync_to_async(call, thread_sensitive=False, executor=DB_EXECUTOR)()
+
+
+async def run_concurrently(*funcs):
+    return await asyncio.gather(*(in_worker_thread(func) for func in funcs))
+
+
+async def arender(request, template_name, context):
+    # Пользователь уже загружен login_required; шаблон не должен делать это повторно
+    request.user = await request.auser()
+    return await sync_to_async(render)(request, template_name, context)
+
+
+def aconditional_page(stamp_func):
+    # condition вызывает функции ETag синхронно, поэтому пользователь
+    # и отметка изменения загружаются заранее, запрос - в рабочем потоке
+    def decorator(view):
+        conditional_view = conditional_page(stamp_func)(view)
+
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            request.user = await request.auser()
+            await in_worker_thread(
+                lambda: page_stamp(request, stamp_func, *args, **kwargs)
+            )
+            return await conditional_view(request, *args, **kwargs)
+
+        return inner
+
+    return decorator
+
+
+@login_required
+@aconditional_page(report_stamp)
+async def student_report_view(request, student_id):
+    course_num, sem_start, sem_end = report_course(request)
+    student, grades, (average_grade, debt_count) = await run_concurrently(
+        lambda: Student.objects.select_related("group__specialty")
+        .filter(id=student_id)
+        .first(),
+        lambda: list(report_grades(student_id, sem_start, sem_end)),
+        lambda: report_totals(student_id, sem_start, sem_end),
+    )
+    if student is None:
+        raise Http404("Студент не найден")
+    return await arender(
+        request,
+        "student_report.html",
+        {
+            "student": student,
+            "course": course_num,
+            "grades": grades,
+            "average_grade": average_grade,
+            "debt_count": debt_count,
+            "sem_start": sem_start,
+            "sem_end": sem_end,
+            "today": date.today(),
+        },
+    )
+
+
+@login_required
+@aconditional_page(documents_stamp)
+async def curriculum_doc_view(request):
+    (specialties,) = await run_concurrently(
+        lambda: curriculum_data(request.page_stamp)
+    )
+    return await arender(
+        request,
+        "curriculum_doc.html",
+        {"specialties": specialties, "title": "Учебный план ИРНИТУ"},
+    )
+
+
+@login_required
+@aconditional_page(documents_stamp)
+async def control_forms_view(request):
+    semester_num = control_forms_semester(request)
+    (grouped_data,) = await run_concurrently(
+        lambda: control_forms_data(semester_num, request.page_stamp)
+    )
+    return await arender(
+        request,
+        "control_forms_doc.html",
+        {"semester": semester_num, "grouped_data": grouped_data},
+    )
@@ -0,0 +1,53 @@
+from django.db import connection
+
+
+def server_connection_stats():
+    # Соединения всех воркеров с текущей базой по данным pg_stat_activity
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT COALESCE(state, 'unknown'), COUNT(*),
+                   COALESCE(MAX(EXTRACT(EPOCH FROM now() - state_change)), 0)
+            FROM pg_stat_activity
+            WHERE datname = current_database() AND backend_type = 'client backend'
+            GROUP BY 1
+            ORDER BY 1
+            """
+        )
+        return {
+            state: {
+                "connections": count,
+                "max_state_seconds": round(max(float(age), 0.0), 1),
+            }
+            for state, count, age in cursor.fetchall()
+        }
+
+
+def pool_stats():
+    # Статистика пула psycopg текущего процесса; None, если пул выключен
+    pool = getattr(connection, "pool", None)
+    if pool is None:
+        return None
+    stats = pool.get_stats()
+    return {
+        "size": stats.get("pool_size", 0),
+        "available": stats.get("pool_available", 0),
+        "in_use": stats.get("pool_size", 0) - stats.get("pool_available", 0),
+        "min_size": stats.get("pool_min", 0),
+        "max_size": stats.get("pool_max", 0),
+        "requests_waiting": stats.get("requests_waiting", 0),
+        "requests_num": stats.get("requests_num", 0),
+        "requests_queued": stats.get("requests_queued", 0),
+        "requests_wait_ms": stats.get("requests_wait_ms", 0),
+        "connections_errors": stats.get("connections_errors", 0),
+    }
+
+
+def connection_stats():
+    settings_dict = connection.settings_dict
+    return {
+        "conn_max_age": settings_dict["CONN_MAX_AGE"],
+        "conn_health_checks": settings_dict["CONN_HEALTH_CHECKS"],
+        "pool": pool_stats(),
+        "server": server_connection_stats(),
+    }
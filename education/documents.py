@@ -0,0 +1,94 @@
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, Max, Value, When
+
+from .models import Discipline, Semester, Specialty
+
+DOCUMENTS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def documents_modified():
+    # MAX(updated_at) читается по индексу; удаление строки его не меняет,
+    # поэтому в версию входит и число строк
+    stamps = [
+        model.objects.aggregate(modified=Max("updated_at"), count=Count("id"))
+        for model in (Specialty, Discipline, Semester)
+    ]
+    modified = max(
+        (stamp["modified"] for stamp in stamps if stamp["modified"]), default=None
+    )
+    return modified, "-".join(str(stamp["count"]) for stamp in stamps)
+
+
+def cached_document(name, build, stamp=None):
+    # Ключ строится из отметки изменения в базе, а не из версии в кеше:
+    # после записи в любом процессе ни один воркер не найдёт старую копию,
+    # в том числе с локальным кешем каждого процесса
+    modified, version = stamp or documents_modified()
+    key = f"documents:{modified.timestamp() if modified else 0}:{version}:{name}"
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, DOCUMENTS_CACHE_TIMEOUT)
+    return data
+
+
+def build_curriculum():
+    specialties = Specialty.objects.prefetch_related("discipline_set").all()
+    return [
+        {
+            "code": spec.code,
+            "name": spec.name,
+            "disciplines": [
+                {
+                    "name": discipline.name,
+                    "hours": discipline.hours,
+                    "exam_type": discipline.exam_type,
+                }
+                for discipline in spec.discipline_set.all()
+            ],
+        }
+        for spec in specialties
+    ]
+
+
+def build_control_forms():
+    # Один упорядоченный запрос на все семестры: группировка по специальности
+    # и колонке документа выполняется в базе данных
+    control_form = Case(
+        *[
+            When(exam_type=exam_type, then=Value(group))
+            for exam_type, group in Discipline.CONTROL_FORM_GROUPS.items()
+        ],
+        output_field=CharField(),
+    )
+    rows = (
+        Discipline.objects.filter(semester__isnull=False, specialty__isnull=False)
+        .annotate(control_form=control_form)
+        .order_by("semester__number", "specialty__code", "control_form", "name")
+        .values_list(
+            "semester__number",
+            "specialty__code",
+            "specialty__name",
+            "control_form",
+            "name",
+        )
+    )
+    semesters = {}
+    for semester_num, spec_code, spec_name, group, name in rows:
+        grouped_data = semesters.setdefault(semester_num, {})
+        forms = grouped_data.setdefault(
+            f"{spec_code} {spec_name}",
+            {"exams": [], "tests": [], "course_works": []},
+        )
+        forms[group].append(name)
+    return semesters
+
+
+def curriculum_data(stamp=None):
+    return cached_document("curriculum", build_curriculum, stamp)
+
+
+def control_forms_data(semester_num, stamp=None):
+    return cached_document("control_forms", build_control_forms, stamp).get(
+        semester_num, {}
+    )
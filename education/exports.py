@@ -0,0 +1,106 @@
+import csv
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.db.models import OuterRef, Subquery
+
+from .models import GradeSheet, TeachingAssignment
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_HEADER = [
+    "Семестр",
+    "Специальность",
+    "Группа",
+    "Фамилия",
+    "Имя",
+    "Отчество",
+    "Дисциплина",
+    "Вид контроля",
+    "Преподаватель",
+    "Оценка",
+    "Дата",
+]
+
+
+class Echo:
+    # Псевдо-файл для csv.writer: возвращает строку вместо записи в буфер
+    def write(self, value):
+        return value
+
+
+def export_grade_sheets(
+    group_id=None,
+    discipline_id=None,
+    specialty_id=None,
+    semester_from=None,
+    semester_to=None,
+):
+    sheets = GradeSheet.objects.all()
+    if group_id is not None:
+        sheets = sheets.filter(student__group_id=group_id)
+    if discipline_id is not None:
+        sheets = sheets.filter(discipline_id=discipline_id)
+    if specialty_id is not None:
+        sheets = sheets.filter(student__group__specialty_id=specialty_id)
+    if semester_from is not None:
+        sheets = sheets.filter(semester__number__gte=semester_from)
+    if semester_to is not None:
+        sheets = sheets.filter(semester__number__lte=semester_to)
+    teachers = TeachingAssignment.objects.filter(
+        discipline_id=OuterRef("discipline_id"), group_id=OuterRef("student__group_id")
+    ).values("teacher__surname")
+    return (
+        sheets.annotate(teacher_surname=Subquery(teachers[:1]))
+        .order_by(
+            "semester__number", "student__group__name", "student__surname", "student_id"
+        )
+        .values_list(
+            "semester__number",
+            "student__group__specialty__code",
+            "student__group__name",
+            "student__surname",
+            "student__first_name",
+            "student__patronymic",
+            "discipline__name",
+            "discipline__exam_type",
+            "teacher_surname",
+            "grade",
+            "date",
+        )
+    )
+
+
+def stream_csv(rows):
+    # Строки читаются серверным курсором порциями, память не растёт с объёмом выгрузки
+    writer = csv.writer(Echo(), delimiter=";")
+    yield "\ufeff"
+    yield writer.writerow(EXPORT_HEADER)
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield writer.writerow(row)
+
+
+async def astream_csv(rows):
+    # Под ASGI синхронный итератор StreamingHttpResponse вычитывается целиком
+    # через sync_to_async(list). Здесь порции строк читаются в отдельном потоке:
+    # серверный курсор остаётся в его соединении до конца выгрузки
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="csv-export")
+    lines = stream_csv(rows)
+
+    def next_chunk():
+        return "".join(islice(lines, EXPORT_CHUNK_SIZE))
+
+    def close():
+        lines.close()
+        connection.close()
+
+    try:
+        while chunk := await sync_to_async(
+            next_chunk, thread_sensitive=False, executor=executor
+        )():
+            yield chunk
+    finally:
+        await sync_to_async(close, thread_sensitive=False, executor=executor)()
+        executor.shutdown(wait=False)
@@ -23,6 +23,11 @@ class AssignTeacherForm(forms.Form):
         label="Выберите преподавателя",
         widget=forms.Select(attrs={"class": "form-select"}),
     )
+    all_groups = forms.BooleanField(
+        required=False,
+        label="Назначить для всех групп специальности",
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    )
 
 
 class StudentForm(forms.ModelForm):
@@ -39,3 +44,36 @@ class StudentForm(forms.ModelForm):
             "first_name": forms.TextInput(attrs={"class": "form-control"}),
             "patronymic": forms.TextInput(attrs={"class": "form-control"}),
         }
+
+
+class RosterImportForm(forms.Form):
+    roster = forms.CharField(
+        label="Список студентов",
+        help_text="По одному студенту в строке: Фамилия Имя Отчество",
+        widget=forms.Textarea(attrs={"class": "form-control", "rows": 8}),
+    )
+
+    def clean_roster(self):
+        rows = []
+        for line_number, line in enumerate(
+            self.cleaned_data["roster"].splitlines(), start=1
+        ):
+            parts = line.split()
+            if not parts:
+                continue
+            if len(parts) < 2:
+                raise forms.ValidationError(
+                    f"Строка {line_number}: укажите как минимум фамилию и имя."
+                )
+            row = (parts[0], parts[1], " ".join(parts[2:]))
+            for name, value in zip(("surname", "first_name", "patronymic"), row):
+                field = Student._meta.get_field(name)
+                if len(value) > field.max_length:
+                    raise forms.ValidationError(
+                        f"Строка {line_number}: {field.verbose_name.lower()} "
+                        f"длиннее {field.max_length} символов."
+                    )
+            rows.append(row)
+        if not rows:
+            raise forms.ValidationError("Список студентов пуст.")
+        return rows
@@ -0,0 +1,151 @@
+import os
+import shutil
+import tempfile
+import traceback
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .exports import EXPORT_CHUNK_SIZE, export_grade_sheets, stream_csv
+from .models import Discipline, Job
+from .reports import REPORT_COURSES, archive_reports, generate_reports, report_students
+from .services import ensure_grade_sheets
+
+JOB_RETRY_DELAY = timedelta(seconds=30)
+
+HANDLERS = {}
+
+
+def handler(kind):
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+
+    return register
+
+
+def result_path(job, extension):
+    os.makedirs(settings.JOB_RESULTS_DIR, exist_ok=True)
+    return os.path.join(settings.JOB_RESULTS_DIR, f"job_{job.id}.{extension}")
+
+
+@handler(Job.ENSURE_GRADE_SHEETS)
+def run_ensure_grade_sheets(job, discipline_id):
+    discipline = Discipline.objects.filter(id=discipline_id).first()
+    if discipline is None:
+        return {"created": 0}
+    return {"created": ensure_grade_sheets(discipline)}
+
+
+@handler(Job.EXPORT_GRADES)
+def run_export_grades(job, **filters):
+    path = result_path(job, "csv")
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        for number, line in enumerate(stream_csv(export_grade_sheets(**filters))):
+            fh.write(line)
+            if number and number % EXPORT_CHUNK_SIZE == 0:
+                job.set_progress(number, 0)
+    return {"file": os.path.basename(path), "filename": "grades.csv"}
+
+
+@handler(Job.BATCH_REPORTS)
+def run_batch_reports(job, courses=None, **filters):
+    path = result_path(job, "zip")
+    with tempfile.TemporaryDirectory() as output_dir:
+        paths = generate_reports(
+            report_students(**filters),
+            output_dir,
+            courses=courses or REPORT_COURSES,
+            progress=job.set_progress,
+        )
+        archive_reports(paths, output_dir, path + ".part")
+    shutil.move(path + ".part", path)
+    return {"file": os.path.basename(path), "filename": "reports.zip"}
+
+
+def submit(kind, user=None, **params):
+    # Без фонового воркера (BACKGROUND_JOBS=False) задача выполняется сразу
+    if settings.BACKGROUND_JOBS:
+        return Job.objects.create(kind=kind, params=params, created_by=user)
+    job = Job.objects.create(
+        kind=kind,
+        params=params,
+        created_by=user,
+        status=Job.RUNNING,
+        attempts=1,
+        max_attempts=1,
+        run_after=timezone.now() + Job.LEASE,
+        started_at=timezone.now(),
+    )
+    return run_job(job)
+
+
+def claim_job():
+    # Каждый воркер забирает свою строку: занятые другими строки пропускаются
+    while True:
+        now = timezone.now()
+        with transaction.atomic():
+            job = (
+                Job.objects.select_for_update(skip_locked=True)
+                .filter(status__in=[Job.QUEUED, Job.RUNNING], run_after__lte=now)
+                .order_by("run_after", "id")
+                .first()
+            )
+            if job is None:
+                return None
+            if job.attempts >= job.max_attempts:
+                # Аренда истекла на последней попытке: воркер пропал, не завершив её
+                job.status = Job.FAILED
+                job.error = (
+                    job.error or "Воркер не завершил задачу за отведённое время."
+                )
+                job.finished_at = now
+                job.save(update_fields=["status", "error", "finished_at"])
+                continue
+            job.status = Job.RUNNING
+            job.attempts += 1
+            job.run_after = now + Job.LEASE
+            job.started_at = now
+            job.save(update_fields=["status", "attempts", "run_after", "started_at"])
+        return job
+
+
+def run_job(job):
+    # Синхронный запуск из сигнала идёт внутри транзакции вызывающего кода:
+    # точка сохранения откатывает ошибку БД обработчика, не прерывая её.
+    # Вне транзакции обработчик работает в autocommit, и ход работы виден сразу
+    in_transaction = transaction.get_connection().in_atomic_block
+    try:
+        with transaction.atomic() if in_transaction else nullcontext():
+            result = HANDLERS[job.kind](job, **job.params)
+    except Exception:
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = Job.QUEUED
+            job.run_after = timezone.now() + JOB_RETRY_DELAY * job.attempts
+        else:
+            job.status = Job.FAILED
+            job.finished_at = timezone.now()
+    else:
+        job.status = Job.DONE
+        job.result = result
+        job.error = ""
+        job.finished_at = timezone.now()
+    job.save(update_fields=["status", "run_after", "result", "error", "finished_at"])
+    return job
+
+
+def job_result_file(job):
+    if job.status != Job.DONE or not (job.result or {}).get("file"):
+        return None
+    path = os.path.join(settings.JOB_RESULTS_DIR, job.result["file"])
+    return path if os.path.exists(path) else None
+
+
+def visible_jobs(user):
+    # Только свои задачи: is_staff есть у всех системных пользователей,
+    # включая преподавателей, и не может служить признаком доступа к выгрузкам
+    return Job.objects.filter(created_by=user)
@@ -0,0 +1,74 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+
+from education.management.commands.benchmark_views import ROLES, percentile
+from education.models import (
+    Discipline,
+    ExamType,
+    GradeSheet,
+    Group,
+    Semester,
+    Student,
+    User,
+)
+from education.views import grade_options
+
+
+class Command(BaseCommand):
+    help = "Замер времени рендеринга ведомости grade_entry.html без обращений к БД"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat: значение должно быть не меньше 1")
+        loaders = engines["django"].engine.loaders
+        self.stdout.write(f"Загрузчики шаблонов: {loaders}")
+        self.stdout.write(
+            f"{'Вид контроля':<16}{'Роль':<13}{'p50, мс':>10}{'p95, мс':>10}"
+            f"{'Среднее, мс':>14}"
+        )
+        for exam_type in [ExamType.EXAM, ExamType.CREDIT]:
+            context = self.sample_context(exam_type, options["rows"])
+            for role in [2, 3]:
+                request = RequestFactory().get("/")
+                request.user = User(id=1, role=role, username=ROLES[role])
+                context["readonly"] = role == 2
+                timings = []
+                # Первый рендеринг прогревочный: компиляция шаблона
+                for attempt in range(options["repeat"] + 1):
+                    start = time.perf_counter()
+                    render_to_string("grade_entry.html", context, request=request)
+                    if attempt:
+                        timings.append((time.perf_counter() - start) * 1000)
+                self.stdout.write(
+                    f"{exam_type:<16}{ROLES[role]:<13}"
+                    f"{percentile(timings, 0.5):>10.2f}"
+                    f"{percentile(timings, 0.95):>10.2f}"
+                    f"{sum(timings) / len(timings):>14.2f}"
+                )
+
+    def sample_context(self, exam_type, rows):
+        # Объекты не сохраняются: замеряется только шаблон
+        discipline = Discipline(
+            id=1, name="Дисциплина", exam_type=exam_type, semester=Semester(number=1)
+        )
+        group = Group(id=1, name="ГР-1")
+        grades = [
+            GradeSheet(
+                id=i + 1,
+                student=Student(surname=f"Студент{i}", first_name="Имя"),
+                grade=[0, 2, 3, 4, 5][i % 5],
+            )
+            for i in range(rows)
+        ]
+        options = grade_options(discipline)
+        for sheet in grades:
+            sheet.options = options.get(sheet.grade, options[None])
+        return {"discipline": discipline, "group": group, "grades": grades}
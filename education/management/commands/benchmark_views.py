@@ -0,0 +1,196 @@
+import json
+import math
+import time
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+
+from education import urls as education_urls
+from education.models import GradeSheet, Student, Teacher, TeachingAssignment
+
+ROLES = {1: "registrar", 2: "directorate", 3: "teacher"}
+
+# Представления, которые меняют данные даже на GET
+SKIPPED_VIEWS = {"delete_student"}
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(share * len(ordered)) - 1)]
+
+
+class QueryCounter:
+    # Обёртка connection.execute_wrapper: число запросов и время в SQL
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class Command(BaseCommand):
+    help = "Замер времени ответа и числа SQL-запросов для представлений education"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--generate",
+            type=int,
+            default=0,
+            metavar="STUDENTS",
+            help="Предварительно сгенерировать данные на указанное число студентов",
+        )
+        parser.add_argument("--output", help="Файл для сохранения результатов в JSON")
+        parser.add_argument("--compare", help="JSON предыдущего прогона для сравнения")
+        parser.add_argument(
+            "--view", action="append", help="Замерять только указанные представления"
+        )
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat: значение должно быть не меньше 1")
+        if options["generate"]:
+            call_command("generate_data", students=options["generate"])
+
+        # Учётные записи замера и привязка преподавателя к одной из них
+        # откатываются: реальный преподаватель не теряет свои дисциплины
+        with transaction.atomic():
+            results = self.measure_views(options)
+            transaction.set_rollback(True)
+
+        baseline = {}
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as fh:
+                baseline = {
+                    (row["view"], row["role"]): row for row in json.load(fh)["results"]
+                }
+        self.report(results, baseline)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                json.dump(
+                    {
+                        "created_at": datetime.now(timezone.utc).isoformat(),
+                        "repeat": options["repeat"],
+                        "students": Student.objects.count(),
+                        "grade_sheets": GradeSheet.objects.count(),
+                        "results": results,
+                    },
+                    fh,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+            self.stdout.write(
+                self.style.SUCCESS(f"Результаты сохранены в {options['output']}")
+            )
+
+    def measure_views(self, options):
+        assignment = (
+            TeachingAssignment.objects.select_related("teacher").order_by("id").first()
+        )
+        student = (
+            Student.objects.filter(group_id=assignment.group_id).order_by("id").first()
+            if assignment
+            else None
+        )
+        if student is None:
+            raise CommandError(
+                "Нет данных для замера. Запустите generate_data или укажите --generate."
+            )
+        sample = {
+            "discipline_id": assignment.discipline_id,
+            "group_id": assignment.group_id,
+            "student_id": student.id,
+        }
+        users = {role: self.benchmark_user(role, assignment.teacher) for role in ROLES}
+
+        results = []
+        for pattern in education_urls.urlpatterns:
+            name = pattern.name
+            if name in SKIPPED_VIEWS:
+                continue
+            if options["view"] and name not in options["view"]:
+                continue
+            # Представления с параметрами без примера (например, job_id) пропускаются
+            if not set(pattern.pattern.converters) <= set(sample):
+                continue
+            url = reverse(
+                name, kwargs={key: sample[key] for key in pattern.pattern.converters}
+            )
+            for role, user in users.items():
+                results.append(self.measure(name, url, role, user, options["repeat"]))
+        return results
+
+    def benchmark_user(self, role, teacher):
+        user, _ = get_user_model().objects.get_or_create(
+            username=f"benchmark_{ROLES[role]}",
+            defaults={"role": role, "surname": "Замер", "first_name": ROLES[role]},
+        )
+        if role == 3 and teacher.user_id != user.id:
+            Teacher.objects.filter(user=user).update(user=None)
+            teacher.user = user
+            teacher.save(update_fields=["user"])
+        return user
+
+    def measure(self, name, url, role, user, repeat):
+        client = Client()
+        client.force_login(user)
+        latencies = []
+        query_count = 0
+        sql_duration = 0.0
+        status = None
+        for attempt in range(repeat + 1):
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                response = client.get(url)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+                elapsed = time.perf_counter() - start
+            status = response.status_code
+            # Первый запрос прогревочный и в статистику не входит
+            if attempt == 0:
+                continue
+            latencies.append(elapsed * 1000)
+            query_count += counter.count
+            sql_duration += counter.duration
+        return {
+            "view": name,
+            "role": ROLES[role],
+            "url": url,
+            "status": status,
+            "p50_ms": round(percentile(latencies, 0.5), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "queries": round(query_count / repeat, 1),
+            "sql_ms": round(sql_duration * 1000 / repeat, 2),
+        }
+
+    def report(self, results, baseline):
+        self.stdout.write(
+            f"{'Представление':<32}{'Роль':<13}{'Код':>5}{'p50, мс':>10}"
+            f"{'p95, мс':>10}{'Запросы':>9}{'SQL, мс':>10}"
+        )
+        for row in results:
+            line = (
+                f"{row['view']:<32}{row['role']:<13}{row['status']:>5}"
+                f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['queries']:>9}"
+                f"{row['sql_ms']:>10}"
+            )
+            previous = baseline.get((row["view"], row["role"]))
+            if previous:
+                line += (
+                    f"  Δp50 {row['p50_ms'] - previous['p50_ms']:+.2f} мс,"
+                    f" Δзапросов {row['queries'] - previous['queries']:+.1f}"
+                )
+            self.stdout.write(line)
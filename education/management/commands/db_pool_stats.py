@@ -0,0 +1,12 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from education.dbstats import connection_stats
+
+
+class Command(BaseCommand):
+    help = "Статистика соединений с PostgreSQL: пул процесса и pg_stat_activity"
+
+    def handle(self, *args, **options):
+        self.stdout.write(json.dumps(connection_stats(), ensure_ascii=False, indent=2))
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from education.models import (
+    Discipline,
+    GradeSheet,
+    Group,
+    Teacher,
+    TeachingAssignment,
+)
+from education.pagination import PAGE_SIZE, keyset_queryset
+from education.views import students_search_queryset
+
+
+class Command(BaseCommand):
+    help = "Вывод планов выполнения (EXPLAIN) основных запросов представлений"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Выполнить запросы (EXPLAIN ANALYZE) и показать фактическое время",
+        )
+
+    def handle(self, *args, **options):
+        sheet = GradeSheet.objects.select_related("student").first()
+        if sheet is None:
+            raise CommandError("В базе нет ведомостей, нечего анализировать.")
+        discipline = Discipline.objects.get(id=sheet.discipline_id)
+        group = Group.objects.get(id=sheet.student.group_id)
+        student = sheet.student
+        teacher = Teacher.objects.filter(
+            id__in=TeachingAssignment.objects.values("teacher_id")[:1]
+        ).first()
+
+        queries = {
+            "grade_entry_view": GradeSheet.objects.filter(
+                discipline=discipline, student__group=group
+            )
+            .select_related("student")
+            .order_by("student__surname", "student__first_name"),
+            "assign_teacher_view": TeachingAssignment.objects.filter(
+                discipline=discipline, group=group
+            ),
+            "student_report_view": GradeSheet.objects.filter(
+                student=student, semester__number__in=[1, 2]
+            )
+            .select_related("discipline", "semester")
+            .order_by("semester__number", "discipline__name"),
+            # Тот же запрос, что строит представление: поиск по трём полям
+            # и первая страница keyset-пагинации
+            "students_search_view": keyset_queryset(
+                students_search_queryset(student.surname[:3]), "surname"
+            )[: PAGE_SIZE + 1],
+        }
+        if teacher is not None:
+            queries["discipline_selection_view"] = TeachingAssignment.objects.filter(
+                teacher=teacher
+            ).values_list("discipline_id", "group_id")
+
+        explain_options = {"analyze": True} if options["analyze"] else {}
+        for name, queryset in queries.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(str(queryset.query))
+            self.stdout.write(queryset.explain(**explain_options))
+            self.stdout.write("")
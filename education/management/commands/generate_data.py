@@ -0,0 +1,254 @@
+import random
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from education.models import (
+    Discipline,
+    ExamType,
+    GradeSheet,
+    Group,
+    Semester,
+    Specialty,
+    Student,
+    Teacher,
+    TeachingAssignment,
+)
+from education.services import allowed_grades, refresh_semester_summaries
+
+SURNAMES = [
+    "Иванов",
+    "Петров",
+    "Сидоров",
+    "Кузнецов",
+    "Попов",
+    "Васильев",
+    "Смирнов",
+    "Соколов",
+    "Михайлов",
+    "Новиков",
+    "Фёдоров",
+    "Морозов",
+    "Волков",
+    "Алексеев",
+    "Лебедев",
+    "Семёнов",
+    "Егоров",
+    "Павлов",
+    "Козлов",
+    "Степанов",
+]
+NAMES = [
+    "Александр",
+    "Дмитрий",
+    "Максим",
+    "Сергей",
+    "Андрей",
+    "Алексей",
+    "Артём",
+    "Илья",
+    "Кирилл",
+    "Михаил",
+]
+PATRONYMICS = [
+    "Иванович",
+    "Петрович",
+    "Сергеевич",
+    "Александрович",
+    "Дмитриевич",
+    "Андреевич",
+]
+POSITIONS = ["Ассистент", "Старший преподаватель", "Доцент", "Профессор"]
+DISCIPLINE_NAMES = [
+    "Математика",
+    "Физика",
+    "Программирование",
+    "Базы данных",
+    "Операционные системы",
+    "Компьютерные сети",
+    "Иностранный язык",
+    "История",
+    "Философия",
+    "Экономика",
+    "Правоведение",
+    "Алгоритмы и структуры данных",
+    "Web-программирование",
+    "Теория вероятностей",
+    "Дискретная математика",
+    "Информационная безопасность",
+]
+# Наименьшие допустимые значения параметров; --teachers может быть не задан
+MIN_OPTIONS = {
+    "students": 0,
+    "specialties": 1,
+    "disciplines_per_semester": 0,
+    "group_size": 1,
+    "teachers": 1,
+    "batch_size": 1,
+}
+
+
+class Command(BaseCommand):
+    help = "Генерация синтетических данных заданного объёма пакетными вставками"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=1000)
+        parser.add_argument("--specialties", type=int, default=4)
+        parser.add_argument("--disciplines-per-semester", type=int, default=6)
+        parser.add_argument("--group-size", type=int, default=25)
+        parser.add_argument("--teachers", type=int, default=None)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        for name, minimum in MIN_OPTIONS.items():
+            if options[name] is not None and options[name] < minimum:
+                raise CommandError(
+                    f"--{name.replace('_', '-')}: значение должно быть не меньше {minimum}"
+                )
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+        today = date.today()
+
+        semesters = {s.number: s for s in Semester.objects.all()}
+        missing = [Semester(number=i) for i in range(1, 9) if i not in semesters]
+        for semester in Semester.objects.bulk_create(missing):
+            semesters[semester.number] = semester
+
+        # Коды 99.xx.xx не пересекаются с реальными направлениями из init_data
+        specialty_count = options["specialties"]
+        specialties = Specialty.objects.bulk_create(
+            [
+                Specialty(
+                    code=f"99.{i // 100:02d}.{i % 100:02d}",
+                    name=f"Направление подготовки № {i + 1}",
+                )
+                for i in range(specialty_count)
+            ]
+        )
+
+        teacher_count = options["teachers"] or specialty_count * 10
+        teachers = Teacher.objects.bulk_create(
+            [
+                Teacher(
+                    surname=rng.choice(SURNAMES),
+                    first_name=rng.choice(NAMES),
+                    patronymic=rng.choice(PATRONYMICS),
+                    position=rng.choice(POSITIONS),
+                )
+                for _ in range(teacher_count)
+            ],
+            batch_size=batch_size,
+        )
+
+        exam_types = ExamType.values
+        disciplines = Discipline.objects.bulk_create(
+            [
+                Discipline(
+                    name=f"{rng.choice(DISCIPLINE_NAMES)} {number}.{k + 1}",
+                    exam_type=rng.choice(exam_types),
+                    hours=rng.choice([36, 72, 108, 144, 180]),
+                    specialty=specialty,
+                    semester=semesters[number],
+                )
+                for specialty in specialties
+                for number in range(1, 9)
+                for k in range(options["disciplines_per_semester"])
+            ],
+            batch_size=batch_size,
+        )
+        disciplines_by_specialty = {}
+        for discipline in disciplines:
+            disciplines_by_specialty.setdefault(discipline.specialty_id, []).append(
+                discipline
+            )
+
+        group_size = options["group_size"]
+        group_count = max(1, -(-options["students"] // group_size))
+        groups = Group.objects.bulk_create(
+            [
+                Group(
+                    specialty=specialties[i % specialty_count],
+                    name=f"ГР-{i + 1}",
+                    admission_year=2021 + i % 5,
+                )
+                for i in range(group_count)
+            ],
+            batch_size=batch_size,
+        )
+        self.stdout.write(
+            f"Специальностей: {len(specialties)}, дисциплин: {len(disciplines)}, "
+            f"групп: {len(groups)}, преподавателей: {len(teachers)}"
+        )
+
+        # Преподаватель закреплён за парой (дисциплина, группа)
+        TeachingAssignment.objects.bulk_create(
+            [
+                TeachingAssignment(
+                    discipline_id=discipline.id,
+                    group_id=group.id,
+                    teacher_id=rng.choice(teachers).id,
+                )
+                for group in groups
+                for discipline in disciplines_by_specialty.get(group.specialty_id, [])
+            ],
+            batch_size=batch_size,
+        )
+        grade_choices = {
+            discipline.id: sorted(g for g in allowed_grades(discipline) if g)
+            for discipline in disciplines
+        }
+
+        created_students = 0
+        created_sheets = 0
+        total_students = options["students"]
+        while created_students < total_students:
+            count = min(batch_size, total_students - created_students)
+            with transaction.atomic():
+                students = Student.objects.bulk_create(
+                    [
+                        Student(
+                            group=groups[(created_students + i) // group_size],
+                            surname=rng.choice(SURNAMES),
+                            first_name=rng.choice(NAMES),
+                            patronymic=rng.choice(PATRONYMICS),
+                        )
+                        for i in range(count)
+                    ]
+                )
+                sheets = []
+                for student in students:
+                    group = student.group
+                    for discipline in disciplines_by_specialty.get(
+                        group.specialty_id, []
+                    ):
+                        sheets.append(
+                            GradeSheet(
+                                student_id=student.id,
+                                discipline_id=discipline.id,
+                                semester_id=discipline.semester_id,
+                                grade=(
+                                    0
+                                    if rng.random() < 0.1
+                                    else rng.choice(grade_choices[discipline.id])
+                                ),
+                                date=today,
+                            )
+                        )
+                GradeSheet.objects.bulk_create(sheets, batch_size=batch_size)
+                refresh_semester_summaries(
+                    [student.id for student in students],
+                    [semester.id for semester in semesters.values()],
+                )
+            created_students += count
+            created_sheets += len(sheets)
+            self.stdout.write(
+                f"Студентов: {created_students}/{total_students}, ведомостей: {created_sheets}"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Создано студентов: {created_students}, записей в ведомостях: {created_sheets}"
+            )
+        )
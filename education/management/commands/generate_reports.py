@@ -0,0 +1,60 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from education.reports import (
+    REPORT_CHUNK_SIZE,
+    REPORT_COURSES,
+    archive_reports,
+    generate_reports,
+    report_students,
+)
+
+
+class Command(BaseCommand):
+    help = "Пакетное формирование отчётов об успеваемости в нескольких процессах"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--group", type=int, help="ID группы")
+        parser.add_argument("--specialty", type=int, help="ID специальности")
+        parser.add_argument("--year", type=int, help="Год поступления (поток)")
+        parser.add_argument(
+            "--courses",
+            type=int,
+            nargs="+",
+            default=REPORT_COURSES,
+            choices=REPORT_COURSES,
+        )
+        parser.add_argument("--output", default="reports", help="Каталог для файлов")
+        parser.add_argument("--archive", help="Дополнительно упаковать отчёты в ZIP")
+        parser.add_argument("--workers", type=int, default=None)
+        parser.add_argument("--chunk-size", type=int, default=REPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if not (options["group"] or options["specialty"] or options["year"]):
+            raise CommandError("Укажите --group, --specialty или --year.")
+        students = report_students(
+            group_id=options["group"],
+            specialty_id=options["specialty"],
+            admission_year=options["year"],
+        )
+        if not students.exists():
+            raise CommandError("Студенты по заданным условиям не найдены.")
+
+        output_dir = os.path.abspath(options["output"])
+        paths = generate_reports(
+            students,
+            output_dir,
+            courses=options["courses"],
+            workers=options["workers"],
+            chunk_size=options["chunk_size"],
+            progress=lambda done, total: self.stdout.write(
+                f"Студентов обработано: {done}/{total}"
+            ),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Сформировано отчётов: {len(paths)} в {output_dir}")
+        )
+        if options["archive"]:
+            archive_reports(paths, output_dir, options["archive"])
+            self.stdout.write(self.style.SUCCESS(f"Архив: {options['archive']}"))
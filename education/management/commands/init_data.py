@@ -1,172 +1,218 @@
 import random
-from datetime import date
 
 from django.core.management.base import BaseCommand
-from django.db.models.signals import post_save
+from django.utils import timezone
 
 from education.models import (
     Discipline,
+    ExamType,
     GradeSheet,
     Group,
     Semester,
     Specialty,
     Student,
     Teacher,
+    TeachingAssignment,
+)
+from education.services import (
+    ensure_grade_sheets,
+    import_roster,
+    refresh_semester_summaries,
 )
-from education.signals import create_grade_sheets_for_new_student
 
 
 class Command(BaseCommand):
     help = "Заполнение БД"
 
+    def get_or_create_all(self, model, objects, *key):
+        # Замена get_or_create на весь список: существующие строки читаются
+        # одним SELECT, недостающие добавляются одним INSERT. При дублях
+        # (generate_data может создать однофамильца) берётся самая ранняя запись
+        def key_of(obj):
+            return tuple(getattr(obj, field) for field in key)
+
+        existing = {}
+        for obj in model.objects.filter(
+            **{f"{key[0]}__in": {getattr(obj, key[0]) for obj in objects}}
+        ).order_by("-id"):
+            existing[key_of(obj)] = obj
+        missing = [obj for obj in objects if key_of(obj) not in existing]
+        for obj in model.objects.bulk_create(missing):
+            existing[key_of(obj)] = obj
+        return [existing[key_of(obj)] for obj in objects], missing
+
     def handle(self, *args, **options):
-        post_save.disconnect(create_grade_sheets_for_new_student, sender=Student)
         self.stdout.write("Начало инициализации данных")
 
-        try:
-            semesters = {
-                i: Semester.objects.get_or_create(number=i)[0] for i in range(1, 9)
-            }
-
-            is_it, _ = Specialty.objects.get_or_create(
-                code="09.03.01",
-                defaults={"name": "Информатика и вычислительная техника"},
-            )
-            is_is, _ = Specialty.objects.get_or_create(
-                code="09.03.02",
-                defaults={"name": "Информационные системы и технологии"},
-            )
-
-            teacher_main, _ = Teacher.objects.get_or_create(
-                surname="Петров",
-                first_name="Иван",
-                defaults={"patronymic": "Сергеевич"},
-            )
-            teacher_sec, _ = Teacher.objects.get_or_create(
-                surname="Сидоров",
-                first_name="Алексей",
-                defaults={"patronymic": "Николаевич"},
-            )
-
-            disciplines_config = [
-                {
-                    "name": "Математика",
-                    "type": "Экзамен",
-                    "hours": 144,
-                    "sem": 1,
-                    "specs": [is_it, is_is],
-                },
-                {
-                    "name": "Программирование Python",
-                    "type": "Зачёт",
-                    "hours": 72,
-                    "sem": 3,
-                    "specs": [is_it, is_is],
-                },
-                {
-                    "name": "Базы данных",
-                    "type": "Экзамен",
-                    "hours": 108,
-                    "sem": 5,
-                    "specs": [is_it],
-                },
-                {
-                    "name": "Базы данных",
-                    "type": "Курсовая работа",
-                    "hours": 36,
-                    "sem": 5,
-                    "specs": [is_it],
-                },
-                {
-                    "name": "Web-программирование",
-                    "type": "Экзамен",
-                    "hours": 180,
-                    "sem": 2,
-                    "specs": [is_is],
-                },
-                {
-                    "name": "Правоведение",
-                    "type": "Зачёт",
-                    "hours": 36,
-                    "sem": 5,
-                    "specs": [is_it],
-                },
-            ]
-
-            for d_info in disciplines_config:
-                for spec in d_info["specs"]:
-                    Discipline.objects.get_or_create(
-                        name=d_info["name"],
-                        specialty=spec,
-                        semester=semesters[d_info["sem"]],
-                        exam_type=d_info["type"],
-                        defaults={"hours": d_info["hours"]},
-                    )
-
-            groups_to_create = [
-                {"name": "ИСИб-23-1", "spec": is_it, "year": 2023},
-                {"name": "ИСТб-23-1", "spec": is_is, "year": 2023},
-                {"name": "ИСИб-25-1", "spec": is_it, "year": 2025},
-            ]
-
-            created_groups = []
-            for g in groups_to_create:
-                group, _ = Group.objects.get_or_create(
-                    name=g["name"],
-                    specialty=g["spec"],
-                    defaults={"admission_year": g["year"]},
+        semesters, _ = self.get_or_create_all(
+            Semester, [Semester(number=i) for i in range(1, 9)], "number"
+        )
+        semesters = {semester.number: semester for semester in semesters}
+
+        (is_it, is_is), _ = self.get_or_create_all(
+            Specialty,
+            [
+                Specialty(code="09.03.01", name="Информатика и вычислительная техника"),
+                Specialty(code="09.03.02", name="Информационные системы и технологии"),
+            ],
+            "code",
+        )
+
+        (teacher_main, teacher_sec), _ = self.get_or_create_all(
+            Teacher,
+            [
+                Teacher(surname="Петров", first_name="Иван", patronymic="Сергеевич"),
+                Teacher(
+                    surname="Сидоров", first_name="Алексей", patronymic="Николаевич"
+                ),
+            ],
+            "surname",
+            "first_name",
+        )
+
+        disciplines_config = [
+            {
+                "name": "Математика",
+                "type": "Экзамен",
+                "hours": 144,
+                "sem": 1,
+                "specs": [is_it, is_is],
+            },
+            {
+                "name": "Программирование Python",
+                "type": "Зачёт",
+                "hours": 72,
+                "sem": 3,
+                "specs": [is_it, is_is],
+            },
+            {
+                "name": "Базы данных",
+                "type": "Экзамен",
+                "hours": 108,
+                "sem": 5,
+                "specs": [is_it],
+            },
+            {
+                "name": "Базы данных",
+                "type": "Курсовая работа",
+                "hours": 36,
+                "sem": 5,
+                "specs": [is_it],
+            },
+            {
+                "name": "Web-программирование",
+                "type": "Экзамен",
+                "hours": 180,
+                "sem": 2,
+                "specs": [is_is],
+            },
+            {
+                "name": "Правоведение",
+                "type": "Зачёт",
+                "hours": 36,
+                "sem": 5,
+                "specs": [is_it],
+            },
+        ]
+
+        _, new_disciplines = self.get_or_create_all(
+            Discipline,
+            [
+                Discipline(
+                    name=d_info["name"],
+                    specialty=spec,
+                    semester=semesters[d_info["sem"]],
+                    exam_type=d_info["type"],
+                    hours=d_info["hours"],
                 )
-                created_groups.append(group)
-
-            surnames = ["Иванов", "Петров", "Сидоров", "Кузнецов", "Попов", "Васильев"]
-            names = ["Александр", "Дмитрий", "Максим", "Сергей"]
-            patronymics = ["Иванович", "Петрович", "Сергеевич"]
-
-            student_count = 0
-            grade_count = 0
-
-            for group in created_groups:
-                group_disciplines = Discipline.objects.filter(specialty=group.specialty)
-
-                for i in range(7):
-                    student, created = Student.objects.get_or_create(
-                        surname=random.choice(surnames),
-                        first_name=random.choice(names),
-                        patronymic=random.choice(patronymics),
-                        group=group,
-                    )
-                    if created:
-                        student_count += 1
-
-                    for disc in group_disciplines:
-                        current_t = (
-                            teacher_main if "Математика" in disc.name else teacher_sec
-                        )
-
-                        if disc.exam_type == "Зачёт":
-                            random_grade = random.choice([2, 5])
-                        else:
-                            random_grade = random.choice([3, 4, 5])
-
-                        _, g_created = GradeSheet.objects.get_or_create(
-                            student=student,
-                            discipline=disc,
-                            semester=disc.semester,
-                            defaults={
-                                "teacher": current_t,
-                                "grade": random_grade,
-                                "date": date.today(),
-                            },
-                        )
-                        if g_created:
-                            grade_count += 1
-
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f"Создано студентов: {student_count}, записей в ведомостях: {grade_count}"
+                for d_info in disciplines_config
+                for spec in d_info["specs"]
+            ],
+            "name",
+            "specialty_id",
+            "semester_id",
+            "exam_type",
+        )
+        # bulk_create не отправляет post_save: ведомости студентов, уже
+        # числящихся на направлении, создаются здесь
+        for discipline in new_disciplines:
+            ensure_grade_sheets(discipline)
+
+        groups, _ = self.get_or_create_all(
+            Group,
+            [
+                Group(name="ИСИб-23-1", specialty=is_it, admission_year=2023),
+                Group(name="ИСТб-23-1", specialty=is_is, admission_year=2023),
+                Group(name="ИСИб-25-1", specialty=is_it, admission_year=2025),
+            ],
+            "name",
+            "specialty_id",
+        )
+
+        disciplines = Discipline.objects.filter(
+            specialty__in=[is_it, is_is]
+        ).values_list("id", "specialty_id", "name")
+        TeachingAssignment.objects.bulk_create(
+            [
+                TeachingAssignment(
+                    discipline_id=discipline_id,
+                    group_id=group.id,
+                    teacher=teacher_main if "Математика" in name else teacher_sec,
                 )
+                for group in groups
+                for discipline_id, specialty_id, name in disciplines
+                if specialty_id == group.specialty_id
+            ],
+            ignore_conflicts=True,
+        )
+
+        surnames = ["Иванов", "Петров", "Сидоров", "Кузнецов", "Попов", "Васильев"]
+        names = ["Александр", "Дмитрий", "Максим", "Сергей"]
+        patronymics = ["Иванович", "Петрович", "Сергеевич"]
+
+        # Студенты добавляются только в пустые группы: повторный запуск
+        # при старте контейнера не плодит записи. import_roster сразу
+        # создаёт незаполненные ведомости, оценки проставляются ниже
+        filled_group_ids = set(
+            Student.objects.filter(group__in=groups).values_list("group_id", flat=True)
+        )
+        new_students = []
+        for group in groups:
+            if group.id in filled_group_ids:
+                continue
+            new_students += import_roster(
+                group,
+                [
+                    (
+                        random.choice(surnames),
+                        random.choice(names),
+                        random.choice(patronymics),
+                    )
+                    for _ in range(7)
+                ],
             )
 
-        finally:
-            post_save.connect(create_grade_sheets_for_new_student, sender=Student)
-            self.stdout.write("Сигналы восстановлены")
+        sheets = list(
+            GradeSheet.objects.filter(student__in=new_students).select_related(
+                "discipline"
+            )
+        )
+        now = timezone.now()
+        for sheet in sheets:
+            if sheet.discipline.exam_type == ExamType.CREDIT:
+                sheet.grade = random.choice([2, 5])
+            else:
+                sheet.grade = random.choice([3, 4, 5])
+            sheet.updated_at = now
+        GradeSheet.objects.bulk_update(sheets, ["grade", "updated_at"], batch_size=1000)
+
+        refresh_semester_summaries(
+            [student.id for student in new_students],
+            Semester.objects.values("id"),
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Создано студентов: {len(new_students)}, записей в ведомостях: {len(sheets)}"
+            )
+        )
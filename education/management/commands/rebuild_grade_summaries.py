@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from education.models import Semester, Student
+from education.services import refresh_semester_summaries
+
+
+class Command(BaseCommand):
+    help = "Пересчёт итогов студентов по семестрам (средний балл, задолженности)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Количество студентов, пересчитываемых за один проход",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        semester_ids = list(Semester.objects.values_list("id", flat=True))
+        student_ids = Student.objects.order_by("id").values_list("id", flat=True)
+
+        total = 0
+        last_id = 0
+        while True:
+            batch = list(student_ids.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            with transaction.atomic():
+                total += refresh_semester_summaries(
+                    batch, semester_ids, prune=True
+                )
+            last_id = batch[-1]
+            self.stdout.write(f"Обработано студентов до id={last_id}, итогов: {total}")
+
+        self.stdout.write(self.style.SUCCESS(f"Пересчитано итогов: {total}"))
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from education.jobs import claim_job, run_job
+
+
+class Command(BaseCommand):
+    help = "Воркер фоновых задач: забирает задачи из очереди и выполняет их"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Выполнить задачи, готовые к запуску, и завершиться",
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=2.0, help="Пауза при пустой очереди, с"
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Воркер запущен")
+        while True:
+            close_old_connections()
+            job = claim_job()
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["sleep"])
+                continue
+            self.stdout.write(f"{job}: попытка {job.attempts}")
+            job = run_job(job)
+            self.stdout.write(f"{job}: {job.get_status_display()}")
@@ -72,10 +72,15 @@ class Command(BaseCommand):
                 user.save()
 
                 if u_data["role"] == 3:
-                    Teacher.objects.get_or_create(
+                    Teacher.objects.update_or_create(
                         surname=u_data["surname"],
                         first_name=u_data["first_name"],
-                        defaults={"patronymic": u_data["patronymic"]},
+                        user=None,
+                        defaults={"user": user},
+                        create_defaults={
+                            "user": user,
+                            "patronymic": u_data["patronymic"],
+                        },
                     )
 
                 self.stdout.write(
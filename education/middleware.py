@@ -0,0 +1,86 @@
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+logger = logging.getLogger("education.sql")
+
+# Счётчик текущего запроса: асинхронные представления подключают его
+# к соединениям своих рабочих потоков (education.async_views.in_worker_thread)
+current_stats = ContextVar("sql_stats", default=None)
+
+
+class QueryStats:
+    # Обёртка connection.execute_wrapper: счётчики без сохранения текста запросов
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            with self.lock:
+                self.duration += duration
+                self.count += 1
+                # Параметры передаются отдельно, поэтому sql уже является
+                # "формой" запроса
+                self.shapes[sql] += 1
+
+
+class SQLInstrumentationMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "SQL_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = getattr(settings, "SQL_REPEAT_THRESHOLD", 10)
+
+    def __call__(self, request):
+        stats = QueryStats()
+        token = current_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(stats):
+                response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        total = time.perf_counter() - start
+
+        sql_ms = round(stats.duration * 1000, 2)
+        timing = (
+            f'db;dur={sql_ms};desc="{stats.count} queries", '
+            f"total;dur={round(total * 1000, 2)}"
+        )
+        if response.has_header("Server-Timing"):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response["Server-Timing"] = timing
+
+        repeated = [
+            {"sql": sql[:300], "count": count}
+            for sql, count in stats.shapes.most_common(3)
+            if count > self.threshold
+        ]
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": stats.count,
+            "sql_ms": sql_ms,
+            "total_ms": round(total * 1000, 2),
+        }
+        if repeated:
+            record["repeated_queries"] = repeated
+            logger.warning(json.dumps(record, ensure_ascii=False))
+        else:
+            logger.info(json.dumps(record, ensure_ascii=False))
+        return response
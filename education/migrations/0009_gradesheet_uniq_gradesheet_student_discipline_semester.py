@@ -0,0 +1,76 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:12
+
+from datetime import date
+
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+
+def remove_duplicate_sheets(apps, schema_editor):
+    # Из дублей остаётся выставленная оценка (не 0) с самой поздней датой,
+    # при равенстве - последняя созданная строка
+    GradeSheet = apps.get_model("education", "GradeSheet")
+    duplicates = (
+        GradeSheet.objects.values("student_id", "discipline_id", "semester_id")
+        .annotate(total=models.Count("id"))
+        .filter(total__gt=1)
+    )
+    for row in duplicates:
+        sheets = GradeSheet.objects.filter(
+            student_id=row["student_id"],
+            discipline_id=row["discipline_id"],
+            semester_id=row["semester_id"],
+        )
+        keep_id = (
+            sheets.order_by(
+                Case(When(grade=0, then=Value(1)), default=Value(0)), "-date", "-id"
+            )
+            .values_list("id", flat=True)
+            .first()
+        )
+        sheets.exclude(id=keep_id).delete()
+
+
+def create_missing_sheets(apps, schema_editor):
+    Discipline = apps.get_model("education", "Discipline")
+    GradeSheet = apps.get_model("education", "GradeSheet")
+    Student = apps.get_model("education", "Student")
+    today = date.today()
+    disciplines = Discipline.objects.filter(
+        specialty__isnull=False, semester__isnull=False
+    )
+    for discipline in disciplines:
+        missing_ids = (
+            Student.objects.filter(group__specialty_id=discipline.specialty_id)
+            .exclude(gradesheet__discipline_id=discipline.id)
+            .values_list("id", flat=True)
+        )
+        GradeSheet.objects.bulk_create(
+            [
+                GradeSheet(
+                    student_id=student_id,
+                    discipline_id=discipline.id,
+                    semester_id=discipline.semester_id,
+                    grade=0,
+                    date=today,
+                )
+                for student_id in missing_ids
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0008_alter_discipline_hours'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_sheets, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='gradesheet',
+            constraint=models.UniqueConstraint(fields=('student', 'discipline', 'semester'), name='uniq_gradesheet_student_discipline_semester'),
+        ),
+        migrations.RunPython(create_missing_sheets, migrations.RunPython.noop),
+    ]
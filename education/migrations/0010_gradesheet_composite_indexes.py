@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0009_gradesheet_uniq_gradesheet_student_discipline_semester'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gradesheet',
+            index=models.Index(fields=['discipline', 'student'], name='gradesheet_disc_student_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gradesheet',
+            index=models.Index(fields=['student', 'semester'], name='gradesheet_student_sem_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gradesheet',
+            index=models.Index(fields=['teacher', 'discipline'], name='gradesheet_teacher_disc_idx'),
+        ),
+        migrations.AlterField(
+            model_name='gradesheet',
+            name='discipline',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='education.discipline'),
+        ),
+        migrations.AlterField(
+            model_name='gradesheet',
+            name='student',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='education.student'),
+        ),
+        migrations.AlterField(
+            model_name='gradesheet',
+            name='teacher',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='education.teacher'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0011_student_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['surname', 'id'], name='student_surname_id_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0012_student_surname_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentSemesterSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grade_count', models.PositiveIntegerField(default=0, verbose_name='Количество оценок')),
+                ('grade_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок')),
+                ('average', models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True, verbose_name='Средний балл')),
+                ('debt_count', models.PositiveIntegerField(default=0, verbose_name='Количество задолженностей')),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='education.semester')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='education.student')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('student', 'semester'), name='uniq_summary_student_semester')],
+            },
+        ),
+        migrations.RunSQL(
+            """
+            INSERT INTO education_studentsemestersummary
+                (student_id, semester_id, grade_count, grade_sum, average, debt_count)
+            SELECT
+                student_id,
+                semester_id,
+                COUNT(*) FILTER (WHERE grade > 0),
+                COALESCE(SUM(grade) FILTER (WHERE grade > 0), 0),
+                ROUND(AVG(grade) FILTER (WHERE grade > 0), 2),
+                COUNT(*) FILTER (WHERE grade = 2)
+            FROM education_gradesheet
+            GROUP BY student_id, semester_id
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:58
+
+import re
+
+from django.db import migrations, models
+
+
+# Известные варианты написания; сравнение без учёта регистра, ё/е, точек и пробелов
+EXAM_TYPE_VARIANTS = {
+    "экзамен": "Экзамен",
+    "зачет": "Зачёт",
+    "дифф зачет": "Дифф. зачёт",
+    "диф зачет": "Дифф. зачёт",
+    "дифференцированный зачет": "Дифф. зачёт",
+    "курсовая работа": "Курсовая работа",
+    "курсовая": "Курсовая работа",
+    "курсовой проект": "Курсовой проект",
+}
+
+
+def normalize_exam_type(value):
+    text = re.sub(r"[.\s]+", " ", (value or "").lower().replace("ё", "е")).strip()
+    return EXAM_TYPE_VARIANTS.get(text)
+
+
+def normalize_exam_types(apps, schema_editor):
+    Discipline = apps.get_model("education", "Discipline")
+    exam_types = Discipline.objects.values_list("exam_type", flat=True).distinct()
+    normalized = {exam_type: normalize_exam_type(exam_type) for exam_type in exam_types}
+    # Неизвестный вид аттестации не угадывается: его нужно исправить вручную
+    unknown = sorted(exam_type for exam_type, value in normalized.items() if not value)
+    if unknown:
+        raise ValueError(
+            "Неизвестные виды аттестации в education_discipline.exam_type: "
+            f"{', '.join(map(repr, unknown))}. Исправьте их и повторите миграцию."
+        )
+    for exam_type, value in normalized.items():
+        if value != exam_type:
+            Discipline.objects.filter(exam_type=exam_type).update(exam_type=value)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0013_studentsemestersummary'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_exam_types, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='discipline',
+            name='exam_type',
+            field=models.CharField(choices=[('Экзамен', 'Экзамен'), ('Зачёт', 'Зачёт'), ('Дифф. зачёт', 'Дифф. зачёт'), ('Курсовая работа', 'Курсовая работа'), ('Курсовой проект', 'Курсовой проект')], default='Экзамен', max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='discipline',
+            index=models.Index(fields=['semester', 'specialty', 'exam_type'], name='discipline_control_forms_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='discipline',
+            constraint=models.CheckConstraint(condition=models.Q(('exam_type__in', ['Экзамен', 'Зачёт', 'Дифф. зачёт', 'Курсовая работа', 'Курсовой проект'])), name='discipline_exam_type_valid'),
+        ),
+    ]
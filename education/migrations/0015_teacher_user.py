@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def link_teacher_users(apps, schema_editor):
+    # Преподаватели из setup_admin создавались по фамилии и имени пользователя;
+    # связь ставится только при однозначном совпадении ФИО
+    User = apps.get_model("education", "User")
+    Teacher = apps.get_model("education", "Teacher")
+    for user in User.objects.filter(role=3, teacher__isnull=True):
+        candidates = Teacher.objects.filter(
+            user__isnull=True, surname=user.surname, first_name=user.first_name
+        )
+        if len(candidates) > 1:
+            candidates = candidates.filter(patronymic=user.patronymic)
+        if len(candidates) == 1:
+            candidates.update(user=user)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0014_normalize_discipline_exam_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teacher',
+            name='user',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='teacher', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+        ),
+        migrations.RunPython(link_teacher_users, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Для каждой пары (дисциплина, группа) берётся преподаватель, указанный
+# в большинстве ведомостей группы
+DERIVE_ASSIGNMENTS_SQL = """
+INSERT INTO education_teachingassignment (discipline_id, group_id, teacher_id)
+SELECT DISTINCT ON (gs.discipline_id, s.group_id)
+       gs.discipline_id, s.group_id, gs.teacher_id
+FROM education_gradesheet gs
+JOIN education_student s ON s.id = gs.student_id
+WHERE gs.teacher_id IS NOT NULL
+GROUP BY gs.discipline_id, s.group_id, gs.teacher_id
+ORDER BY gs.discipline_id, s.group_id, COUNT(*) DESC, gs.teacher_id
+"""
+
+RESTORE_SHEET_TEACHERS_SQL = """
+UPDATE education_gradesheet gs
+SET teacher_id = ta.teacher_id
+FROM education_teachingassignment ta, education_student s
+WHERE s.id = gs.student_id
+  AND ta.group_id = s.group_id
+  AND ta.discipline_id = gs.discipline_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0015_teacher_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeachingAssignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='teachingassignment',
+            name='discipline',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='education.discipline'),
+        ),
+        migrations.AddField(
+            model_name='teachingassignment',
+            name='group',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='education.group'),
+        ),
+        migrations.AddField(
+            model_name='teachingassignment',
+            name='teacher',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='education.teacher'),
+        ),
+        migrations.AddIndex(
+            model_name='teachingassignment',
+            index=models.Index(fields=['teacher', 'discipline'], name='assignment_teacher_disc_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='teachingassignment',
+            constraint=models.UniqueConstraint(fields=('discipline', 'group'), name='uniq_assignment_discipline_group'),
+        ),
+        migrations.RunSQL(DERIVE_ASSIGNMENTS_SQL, RESTORE_SHEET_TEACHERS_SQL),
+        migrations.RemoveIndex(
+            model_name='gradesheet',
+            name='gradesheet_teacher_disc_idx',
+        ),
+        migrations.RemoveField(
+            model_name='gradesheet',
+            name='teacher',
+        ),
+    ]
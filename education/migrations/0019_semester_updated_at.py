@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0018_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='semester',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Изменено'),
+        ),
+    ]
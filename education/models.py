@@ -1,5 +1,10 @@
+from datetime import timedelta
+
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -20,6 +25,7 @@ class User(AbstractUser):
 class Specialty(models.Model):
     code = models.CharField("Код", max_length=20)
     name = models.CharField("Наименование", max_length=255)
+    updated_at = models.DateTimeField("Изменено", auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.code} {self.name}"
@@ -29,6 +35,7 @@ class Group(models.Model):
     specialty = models.ForeignKey(Specialty, on_delete=models.CASCADE)
     name = models.CharField("Наименование", max_length=50)
     admission_year = models.IntegerField("Год поступления")
+    updated_at = models.DateTimeField("Изменено", auto_now=True, db_index=True)
 
     def __str__(self):
         return self.name
@@ -39,14 +46,54 @@ class Student(models.Model):
     surname = models.CharField("Фамилия", max_length=100)
     first_name = models.CharField("Имя", max_length=100)
     patronymic = models.CharField("Отчество", max_length=100, blank=True)
+    updated_at = models.DateTimeField("Изменено", auto_now=True, db_index=True)
+
+    class Meta:
+        # icontains в PostgreSQL строится как UPPER(col) LIKE UPPER(%s),
+        # поэтому триграммные индексы построены по UPPER(...)
+        indexes = [
+            GinIndex(
+                OpClass(Upper("surname"), name="gin_trgm_ops"),
+                name="student_surname_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("first_name"), name="gin_trgm_ops"),
+                name="student_first_name_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("patronymic"), name="gin_trgm_ops"),
+                name="student_patronymic_trgm_idx",
+            ),
+            # Постраничный вывод списка студентов по (surname, id)
+            models.Index(fields=["surname", "id"], name="student_surname_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.surname} {self.first_name}"
 
 
+class ExamType(models.TextChoices):
+    EXAM = "Экзамен", "Экзамен"
+    CREDIT = "Зачёт", "Зачёт"
+    GRADED_CREDIT = "Дифф. зачёт", "Дифф. зачёт"
+    COURSE_WORK = "Курсовая работа", "Курсовая работа"
+    COURSE_PROJECT = "Курсовой проект", "Курсовой проект"
+
+
 class Discipline(models.Model):
+    # Колонка документа "Формы контроля", в которую попадает вид аттестации
+    CONTROL_FORM_GROUPS = {
+        ExamType.EXAM: "exams",
+        ExamType.CREDIT: "tests",
+        ExamType.GRADED_CREDIT: "tests",
+        ExamType.COURSE_WORK: "course_works",
+        ExamType.COURSE_PROJECT: "course_works",
+    }
+
     name = models.CharField(max_length=255)
-    exam_type = models.CharField(max_length=50, default="Экзамен")
+    exam_type = models.CharField(
+        max_length=50, choices=ExamType.choices, default=ExamType.EXAM
+    )
     hours = models.PositiveIntegerField(default=72, verbose_name="Часы")
     specialty = models.ForeignKey(
         "Specialty", on_delete=models.CASCADE, null=True, blank=True
@@ -54,6 +101,21 @@ class Discipline(models.Model):
     semester = models.ForeignKey(
         "Semester", on_delete=models.CASCADE, null=True, blank=True
     )
+    updated_at = models.DateTimeField("Изменено", auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["semester", "specialty", "exam_type"],
+                name="discipline_control_forms_idx",
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(exam_type__in=ExamType.values),
+                name="discipline_exam_type_valid",
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -61,6 +123,7 @@ class Discipline(models.Model):
 
 class Semester(models.Model):
     number = models.IntegerField("Номер семестра")
+    updated_at = models.DateTimeField("Изменено", auto_now=True, db_index=True)
 
     def __str__(self):
         return f"Семестр {self.number}"
@@ -74,6 +137,14 @@ class Curriculum(models.Model):
 
 
 class Teacher(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="teacher",
+        verbose_name="Пользователь",
+    )
     surname = models.CharField("Фамилия", max_length=100)
     first_name = models.CharField("Имя", max_length=100)
     patronymic = models.CharField("Отчество", max_length=100, blank=True)
@@ -83,12 +154,145 @@ class Teacher(models.Model):
         return f"{self.surname} {self.position}"
 
 
+class TeachingAssignment(models.Model):
+    # Преподаватель дисциплины в группе: одна строка на пару (дисциплина, группа)
+    discipline = models.ForeignKey(
+        Discipline, on_delete=models.CASCADE, db_index=False
+    )
+    group = models.ForeignKey(Group, on_delete=models.CASCADE)
+    teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE, db_index=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["discipline", "group"], name="uniq_assignment_discipline_group"
+            ),
+        ]
+        indexes = [
+            # discipline_selection_view: дисциплины преподавателя
+            models.Index(
+                fields=["teacher", "discipline"], name="assignment_teacher_disc_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.discipline} — {self.group}: {self.teacher}"
+
+
 class GradeSheet(models.Model):
-    student = models.ForeignKey(Student, on_delete=models.CASCADE)
-    discipline = models.ForeignKey(Discipline, on_delete=models.CASCADE)
-    semester = models.ForeignKey(Semester, on_delete=models.CASCADE)
-    teacher = models.ForeignKey(
-        "Teacher", on_delete=models.CASCADE, null=True, blank=True
+    # Одиночные индексы FK заменены составными индексами из Meta
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, db_index=False)
+    discipline = models.ForeignKey(
+        Discipline, on_delete=models.CASCADE, db_index=False
     )
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE)
     grade = models.IntegerField("Оценка")
     date = models.DateField("Дата")
+    updated_at = models.DateTimeField("Изменено", auto_now=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "discipline", "semester"],
+                name="uniq_gradesheet_student_discipline_semester",
+            ),
+        ]
+        indexes = [
+            # grade_entry_view, assign_teacher_view: discipline + student__group
+            models.Index(
+                fields=["discipline", "student"], name="gradesheet_disc_student_idx"
+            ),
+            # student_report_view: student + semester__number
+            models.Index(
+                fields=["student", "semester"], name="gradesheet_student_sem_idx"
+            ),
+        ]
+
+
+class StudentSemesterSummary(models.Model):
+    # Итоги студента за семестр, пересчитываются при каждой записи оценок
+    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE)
+    grade_count = models.PositiveIntegerField("Количество оценок", default=0)
+    grade_sum = models.PositiveIntegerField("Сумма оценок", default=0)
+    average = models.DecimalField(
+        "Средний балл", max_digits=4, decimal_places=2, null=True, blank=True
+    )
+    debt_count = models.PositiveIntegerField("Количество задолженностей", default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "semester"],
+                name="uniq_summary_student_semester",
+            ),
+        ]
+
+
+class Job(models.Model):
+    # Фоновая задача; выполняется командой run_jobs
+    ENSURE_GRADE_SHEETS = "ensure_grade_sheets"
+    EXPORT_GRADES = "export_grades"
+    BATCH_REPORTS = "batch_reports"
+    KIND_CHOICES = [
+        (ENSURE_GRADE_SHEETS, "Создание ведомостей по дисциплине"),
+        (EXPORT_GRADES, "Выгрузка оценок в CSV"),
+        (BATCH_REPORTS, "Пакет отчётов об успеваемости"),
+    ]
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "В очереди"),
+        (RUNNING, "Выполняется"),
+        (DONE, "Выполнена"),
+        (FAILED, "Ошибка"),
+    ]
+    # Выполняемая задача, чей воркер не отчитался за это время, снова считается
+    # свободной; отчёт о ходе работы (set_progress) продлевает аренду
+    LEASE = timedelta(minutes=10)
+
+    kind = models.CharField("Тип", max_length=50, choices=KIND_CHOICES)
+    params = models.JSONField("Параметры", default=dict, blank=True)
+    status = models.CharField(
+        "Состояние", max_length=20, choices=STATUS_CHOICES, default=QUEUED
+    )
+    attempts = models.PositiveSmallIntegerField("Попыток", default=0)
+    max_attempts = models.PositiveSmallIntegerField("Максимум попыток", default=3)
+    # Для задачи в очереди - не раньше этого времени, для выполняемой - срок аренды
+    run_after = models.DateTimeField("Запуск не ранее", default=timezone.now)
+    progress = models.PositiveIntegerField("Выполнено", default=0)
+    total = models.PositiveIntegerField("Всего", default=0)
+    result = models.JSONField("Результат", null=True, blank=True)
+    error = models.TextField("Ошибка", blank=True)
+    created_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    created_at = models.DateTimeField("Создана", auto_now_add=True)
+    started_at = models.DateTimeField("Начата", null=True, blank=True)
+    finished_at = models.DateTimeField("Завершена", null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # run_jobs: ближайшая задача к запуску, SELECT ... FOR UPDATE SKIP LOCKED
+            models.Index(
+                fields=["run_after"],
+                name="job_pending_idx",
+                condition=models.Q(status__in=["queued", "running"]),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.id}"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.DONE, self.FAILED)
+
+    def set_progress(self, progress, total):
+        self.progress, self.total = progress, total
+        self.run_after = timezone.now() + self.LEASE
+        Job.objects.filter(id=self.id).update(
+            progress=progress, total=total, run_after=self.run_after
+        )
@@ -0,0 +1,71 @@
+import json
+
+from django.db.models import F, Field, Func, Value
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+PAGE_SIZE = 50
+
+
+class KeysetPage:
+    def __init__(self, object_list, is_first, first_query, next_query):
+        self.object_list = object_list
+        self.is_first = is_first
+        self.first_query = first_query
+        self.next_query = next_query
+
+    @property
+    def has_next(self):
+        return self.next_query is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+
+def encode_cursor(value, last_id):
+    return urlsafe_base64_encode(json.dumps([value, last_id]).encode())
+
+
+def decode_cursor(cursor):
+    try:
+        value, last_id = json.loads(urlsafe_base64_decode(cursor))
+        return value, int(last_id)
+    except (ValueError, TypeError):
+        return None
+
+
+class Row(Func):
+    # Конструктор строки PostgreSQL: (a, b) > (x, y) сравнивает пары целиком
+    function = "ROW"
+    output_field = Field()
+
+
+def keyset_queryset(queryset, field, cursor=None):
+    # Постраничный вывод по (field, id) без OFFSET: следующая страница
+    # начинается строго после последней пары (field, id) предыдущей.
+    # Сравнение строк, а не a > x OR (a = x AND id > y), даёт диапазонный
+    # поиск по составному индексу (field, id)
+    queryset = queryset.order_by(field, "id")
+    if cursor is not None:
+        value, last_id = cursor
+        queryset = queryset.alias(keyset=Row(F(field), F("id"))).filter(
+            keyset__gt=Row(Value(value), Value(last_id))
+        )
+    return queryset
+
+
+def keyset_paginate(request, queryset, field, page_size=PAGE_SIZE):
+    cursor = decode_cursor(request.GET.get("after", ""))
+    queryset = keyset_queryset(queryset, field, cursor)
+    items = list(queryset[: page_size + 1])
+    has_next = len(items) > page_size
+    items = items[:page_size]
+
+    params = request.GET.copy()
+    params.pop("after", None)
+    first_query = params.urlencode()
+    next_query = None
+    if has_next:
+        last = items[-1]
+        params["after"] = encode_cursor(getattr(last, field), last.id)
+        next_query = params.urlencode()
+    return KeysetPage(items, cursor is None, first_query, next_query)
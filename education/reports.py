@@ -0,0 +1,119 @@
+import os
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+import django
+from django.db import connections
+from django.template.loader import render_to_string
+from django.utils.text import get_valid_filename
+
+from .models import GradeSheet, Student
+
+REPORT_COURSES = [1, 2, 3, 4]
+REPORT_CHUNK_SIZE = 50
+
+
+def report_students(group_id=None, specialty_id=None, admission_year=None):
+    students = Student.objects.all()
+    if group_id is not None:
+        students = students.filter(group_id=group_id)
+    if specialty_id is not None:
+        students = students.filter(group__specialty_id=specialty_id)
+    if admission_year is not None:
+        students = students.filter(group__admission_year=admission_year)
+    return students.order_by("group__name", "surname", "first_name", "id")
+
+
+def report_filename(student, course):
+    name = f"{student.surname}_{student.first_name}_{student.id}_курс{course}.html"
+    return os.path.join(
+        get_valid_filename(student.group.name), get_valid_filename(name)
+    )
+
+
+def render_reports_chunk(student_ids, courses, output_dir):
+    # Выполняется в дочернем процессе: один запрос за студентами пачки,
+    # один за всеми их оценками, дальше только рендеринг шаблона
+    students = Student.objects.filter(id__in=student_ids).select_related(
+        "group__specialty"
+    )
+    grades = defaultdict(list)
+    for sheet in (
+        GradeSheet.objects.filter(student_id__in=student_ids)
+        .select_related("discipline", "semester")
+        .order_by("semester__number", "discipline__name")
+    ):
+        grades[sheet.student_id].append(sheet)
+
+    today = date.today()
+    paths = []
+    for student in students:
+        for course in courses:
+            sem_end = course * 2
+            sem_start = sem_end - 1
+            course_grades = [
+                sheet
+                for sheet in grades[student.id]
+                if sheet.semester.number in (sem_start, sem_end)
+            ]
+            # Те же правила, что и в сводке StudentSemesterSummary
+            marks = [sheet.grade for sheet in course_grades if sheet.grade > 0]
+            # Файл без навигации сайта: только карточка для печати
+            html = render_to_string(
+                "student_report_print.html",
+                {
+                    "student": student,
+                    "course": course,
+                    "grades": course_grades,
+                    "average_grade": sum(marks) / len(marks) if marks else None,
+                    "debt_count": sum(1 for mark in marks if mark == 2),
+                    "sem_start": sem_start,
+                    "sem_end": sem_end,
+                    "today": today,
+                },
+            )
+            path = os.path.join(output_dir, report_filename(student, course))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write(html)
+            paths.append(path)
+    connections.close_all()
+    return paths
+
+
+def generate_reports(
+    students,
+    output_dir,
+    courses=REPORT_COURSES,
+    workers=None,
+    chunk_size=REPORT_CHUNK_SIZE,
+    progress=None,
+):
+    student_ids = list(students.values_list("id", flat=True))
+    chunks = [
+        student_ids[i : i + chunk_size] for i in range(0, len(student_ids), chunk_size)
+    ]
+    # Дочерние процессы не должны унаследовать открытые соединения родителя
+    connections.close_all()
+    paths = []
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        futures = {
+            pool.submit(render_reports_chunk, chunk, courses, output_dir): len(chunk)
+            for chunk in chunks
+        }
+        for future in as_completed(futures):
+            paths.extend(future.result())
+            done += futures[future]
+            if progress is not None:
+                progress(done, len(student_ids))
+    return sorted(paths)
+
+
+def archive_reports(paths, output_dir, archive_path):
+    with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path in paths:
+            archive.write(path, os.path.relpath(path, output_dir))
+    return archive_path
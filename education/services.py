@@ -0,0 +1,224 @@
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q, Sum
+from django.utils import timezone
+
+from .models import (
+    Discipline,
+    ExamType,
+    GradeSheet,
+    Student,
+    StudentSemesterSummary,
+    TeachingAssignment,
+)
+
+EXAM_GRADES = {0, 2, 3, 4, 5}
+PASS_FAIL_GRADES = {0, 2, 5}
+
+
+def allowed_grades(discipline):
+    if discipline.exam_type == ExamType.CREDIT:
+        return PASS_FAIL_GRADES
+    return EXAM_GRADES
+
+
+def collect_changed_grades(discipline, group, data):
+    # Одним запросом читаем текущие оценки группы и сравниваем с формой
+    current = GradeSheet.objects.filter(
+        discipline=discipline, student__group=group
+    ).values_list("id", "grade")
+    allowed = allowed_grades(discipline)
+    changed = {}
+    errors = []
+    for sheet_id, grade in current:
+        raw = data.get(f"grade_{sheet_id}")
+        if raw is None:
+            continue
+        try:
+            new_grade = int(raw)
+        except (TypeError, ValueError):
+            errors.append(sheet_id)
+            continue
+        if new_grade not in allowed:
+            errors.append(sheet_id)
+        elif new_grade != grade:
+            changed[sheet_id] = new_grade
+    return changed, errors
+
+
+def save_grades(changed):
+    if not changed:
+        return 0
+    # bulk_update не вызывает auto_now, поэтому updated_at задаётся явно
+    now = timezone.now()
+    sheets = [
+        GradeSheet(id=sheet_id, grade=grade, updated_at=now)
+        for sheet_id, grade in changed.items()
+    ]
+    changed_sheets = GradeSheet.objects.filter(id__in=list(changed))
+    with transaction.atomic():
+        updated_count = GradeSheet.objects.bulk_update(sheets, ["grade", "updated_at"])
+        refresh_semester_summaries(
+            changed_sheets.values("student_id"), changed_sheets.values("semester_id")
+        )
+    return updated_count
+
+
+def ensure_grade_sheets(discipline, students=None):
+    # Создаёт недостающие ведомости одним INSERT ... ON CONFLICT DO NOTHING
+    if discipline.specialty_id is None or discipline.semester_id is None:
+        return 0
+    if students is None:
+        students = Student.objects.filter(group__specialty_id=discipline.specialty_id)
+    missing_ids = students.exclude(gradesheet__discipline=discipline).values_list(
+        "id", flat=True
+    )
+    today = date.today()
+    sheets = [
+        GradeSheet(
+            student_id=student_id,
+            discipline_id=discipline.id,
+            semester_id=discipline.semester_id,
+            grade=0,
+            date=today,
+        )
+        for student_id in missing_ids
+    ]
+    if not sheets:
+        return 0
+    GradeSheet.objects.bulk_create(sheets, ignore_conflicts=True)
+    return len(sheets)
+
+
+def move_grade_sheets(discipline):
+    # Ведомости хранят семестр дисциплины; после его смены переносим их одним
+    # UPDATE и пересчитываем итоги студентов в прежнем и новом семестрах
+    if discipline.semester_id is None:
+        return 0
+    moved = GradeSheet.objects.filter(discipline=discipline).exclude(
+        semester_id=discipline.semester_id
+    )
+    old_semester_ids = list(moved.values_list("semester_id", flat=True).distinct())
+    if not old_semester_ids:
+        return 0
+    student_ids = list(moved.values_list("student_id", flat=True))
+    with transaction.atomic():
+        moved_count = moved.update(
+            semester_id=discipline.semester_id, updated_at=timezone.now()
+        )
+        refresh_semester_summaries(
+            student_ids, [*old_semester_ids, discipline.semester_id], prune=True
+        )
+    return moved_count
+
+
+def assign_teacher(discipline, teacher, groups):
+    # Одна строка назначения на группу, INSERT ... ON CONFLICT DO UPDATE
+    group_ids = list(groups.values_list("id", flat=True))
+    TeachingAssignment.objects.bulk_create(
+        [
+            TeachingAssignment(
+                discipline_id=discipline.id, group_id=group_id, teacher_id=teacher.id
+            )
+            for group_id in group_ids
+        ],
+        update_conflicts=True,
+        unique_fields=["discipline", "group"],
+        update_fields=["teacher"],
+    )
+    return len(group_ids)
+
+
+def create_grade_sheets_for_students(students, specialty_id):
+    # Все ведомости для пачки студентов одним INSERT на пачку
+    disciplines = list(
+        Discipline.objects.filter(
+            specialty_id=specialty_id, semester__isnull=False
+        ).values_list("id", "semester_id")
+    )
+    today = date.today()
+    sheets = [
+        GradeSheet(
+            student_id=student.id,
+            discipline_id=discipline_id,
+            semester_id=semester_id,
+            grade=0,
+            date=today,
+        )
+        for student in students
+        for discipline_id, semester_id in disciplines
+    ]
+    GradeSheet.objects.bulk_create(sheets, ignore_conflicts=True, batch_size=1000)
+    return len(sheets)
+
+
+def import_roster(group, rows):
+    # bulk_create не отправляет post_save, поэтому сигнал студента здесь не срабатывает
+    with transaction.atomic():
+        students = Student.objects.bulk_create(
+            [
+                Student(
+                    group=group,
+                    surname=surname,
+                    first_name=first_name,
+                    patronymic=patronymic,
+                )
+                for surname, first_name, patronymic in rows
+            ]
+        )
+        create_grade_sheets_for_students(students, group.specialty_id)
+    return students
+
+
+def refresh_semester_summaries(student_ids, semester_ids, prune=False):
+    # Пересчёт итогов для всех пар (студент, семестр) из заданных множеств:
+    # один агрегирующий SELECT и один INSERT ... ON CONFLICT DO UPDATE.
+    # Нулевые оценки (ещё не выставленные) в средний балл не входят.
+    totals = (
+        GradeSheet.objects.filter(
+            student_id__in=student_ids, semester_id__in=semester_ids
+        )
+        .values("student_id", "semester_id")
+        .annotate(
+            grade_count=Count("id", filter=Q(grade__gt=0)),
+            grade_sum=Sum("grade", filter=Q(grade__gt=0), default=0),
+            debt_count=Count("id", filter=Q(grade=2)),
+        )
+        .order_by()
+    )
+    summaries = [
+        StudentSemesterSummary(
+            student_id=row["student_id"],
+            semester_id=row["semester_id"],
+            grade_count=row["grade_count"],
+            grade_sum=row["grade_sum"],
+            average=(
+                round(Decimal(row["grade_sum"]) / row["grade_count"], 2)
+                if row["grade_count"]
+                else None
+            ),
+            debt_count=row["debt_count"],
+        )
+        for row in totals
+    ]
+    StudentSemesterSummary.objects.bulk_create(
+        summaries,
+        update_conflicts=True,
+        unique_fields=["student", "semester"],
+        update_fields=["grade_count", "grade_sum", "average", "debt_count"],
+        batch_size=1000,
+    )
+    if prune:
+        StudentSemesterSummary.objects.filter(
+            student_id__in=student_ids, semester_id__in=semester_ids
+        ).exclude(
+            Exists(
+                GradeSheet.objects.filter(
+                    student_id=OuterRef("student_id"),
+                    semester_id=OuterRef("semester_id"),
+                )
+            )
+        ).delete()
+    return len(summaries)
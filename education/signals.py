@@ -1,23 +1,49 @@
-from datetime import date
-
-from django.db.models.signals import post_save
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from .models import Discipline, GradeSheet, Student
+from .backends import invalidate_cached_user
+from .jobs import submit
+from .models import Discipline, Job, Student, User
+from .services import (
+    create_grade_sheets_for_students,
+    move_grade_sheets,
+    refresh_semester_summaries,
+)
 
 
 @receiver(post_save, sender=Student)
 def create_grade_sheets_for_new_student(sender, instance, created, **kwargs):
     if created:
-        disciplines = Discipline.objects.filter(specialty=instance.group.specialty)
-
-        for discipline in disciplines:
-            GradeSheet.objects.get_or_create(
-                student=instance,
-                discipline=discipline,
-                semester=discipline.semester,
-                defaults={
-                    "grade": 0,
-                    "date": date.today(),
-                },
-            )
+        create_grade_sheets_for_students([instance], instance.group.specialty_id)
+
+
+@receiver(post_save, sender=Discipline)
+def sync_grade_sheets_for_discipline(sender, instance, created, **kwargs):
+    if created:
+        submit(Job.ENSURE_GRADE_SHEETS, discipline_id=instance.id)
+    else:
+        move_grade_sheets(instance)
+
+
+@receiver(post_delete, sender=Discipline)
+def refresh_summaries_for_deleted_discipline(sender, instance, **kwargs):
+    if instance.specialty_id is None or instance.semester_id is None:
+        return
+    refresh_semester_summaries(
+        Student.objects.filter(group__specialty_id=instance.specialty_id).values("id"),
+        [instance.semester_id],
+        prune=True,
+    )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def invalidate_user_cache_on_logout(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_cached_user(user.pk)
@@ -1 +1,1270 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import Count, Q, Sum
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .backends import CachedModelBackend, user_cache_key
+from .documents import (
+    cached_document,
+    control_forms_data,
+    curriculum_data,
+    documents_modified,
+)
+from .exports import EXPORT_HEADER
+from .forms import RosterImportForm
+from .jobs import HANDLERS, JOB_RETRY_DELAY, claim_job, run_job, submit
+from .models import (
+    Discipline,
+    ExamType,
+    GradeSheet,
+    Group,
+    Job,
+    Semester,
+    Specialty,
+    Student,
+    StudentSemesterSummary,
+    Teacher,
+    TeachingAssignment,
+    User,
+)
+from .pagination import (
+    PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+    keyset_paginate,
+    keyset_queryset,
+)
+from .reports import archive_reports, generate_reports, report_filename, report_students
+from .services import (
+    assign_teacher,
+    collect_changed_grades,
+    ensure_grade_sheets,
+    import_roster,
+    save_grades,
+)
+
+
+class EducationTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.semester1 = Semester.objects.create(number=1)
+        cls.semester2 = Semester.objects.create(number=2)
+        cls.specialty = Specialty.objects.create(code="09.03.01", name="ИВТ")
+        cls.group = Group.objects.create(
+            specialty=cls.specialty, name="ИВТ-1", admission_year=2024
+        )
+        cls.students = [
+            Student.objects.create(group=cls.group, surname=surname, first_name="Иван")
+            for surname in ["Алексеев", "Алексеев", "Борисов", "Алексеев", "Васильев"]
+        ]
+        cls.exam = Discipline.objects.create(
+            name="Математика",
+            exam_type=ExamType.EXAM,
+            specialty=cls.specialty,
+            semester=cls.semester1,
+        )
+        cls.credit = Discipline.objects.create(
+            name="Физкультура",
+            exam_type=ExamType.CREDIT,
+            specialty=cls.specialty,
+            semester=cls.semester1,
+        )
+        cls.second_exam = Discipline.objects.create(
+            name="Физика",
+            exam_type=ExamType.EXAM,
+            specialty=cls.specialty,
+            semester=cls.semester2,
+        )
+        cls.registrar = User.objects.create_user(
+            "registrar", password="pass", role=1, surname="Регистратор"
+        )
+
+    def sheet(self, student, discipline):
+        return GradeSheet.objects.get(student=student, discipline=discipline)
+
+    def set_grades(self, grades):
+        save_grades(
+            {
+                self.sheet(student, discipline).id: grade
+                for (student, discipline), grade in grades.items()
+            }
+        )
+
+
+class SemesterSummaryTests(EducationTestCase):
+    def assertSummariesMatchGrades(self):
+        # Итоги должны совпадать с агрегатом по ведомостям для каждой пары
+        # (студент, семестр); пара без оценок может не иметь итога вовсе
+        totals = {
+            (row["student_id"], row["semester_id"]): row
+            for row in GradeSheet.objects.values("student_id", "semester_id")
+            .annotate(
+                grade_count=Count("id", filter=Q(grade__gt=0)),
+                grade_sum=Sum("grade", filter=Q(grade__gt=0), default=0),
+                debt_count=Count("id", filter=Q(grade=2)),
+            )
+            .order_by()
+        }
+        summaries = {
+            (summary.student_id, summary.semester_id): summary
+            for summary in StudentSemesterSummary.objects.all()
+        }
+        self.assertLessEqual(summaries.keys(), totals.keys())
+        for key, row in totals.items():
+            summary = summaries.get(key)
+            if summary is None:
+                self.assertEqual(row["grade_count"], 0, key)
+                continue
+            self.assertEqual(summary.grade_count, row["grade_count"], key)
+            self.assertEqual(summary.grade_sum, row["grade_sum"], key)
+            self.assertEqual(summary.debt_count, row["debt_count"], key)
+            if row["grade_count"]:
+                average = round(Decimal(row["grade_sum"]) / row["grade_count"], 2)
+                self.assertEqual(summary.average, average, key)
+            else:
+                self.assertIsNone(summary.average, key)
+
+    def test_save_grades_updates_summary(self):
+        student = self.students[0]
+        self.set_grades({(student, self.exam): 4, (student, self.credit): 2})
+        self.assertSummariesMatchGrades()
+        summary = StudentSemesterSummary.objects.get(
+            student=student, semester=self.semester1
+        )
+        self.assertEqual(
+            (summary.grade_count, summary.grade_sum, summary.debt_count), (2, 6, 1)
+        )
+        self.assertEqual(summary.average, Decimal("3.00"))
+
+        self.set_grades({(student, self.credit): 5})
+        self.assertSummariesMatchGrades()
+        summary.refresh_from_db()
+        self.assertEqual(summary.debt_count, 0)
+        self.assertEqual(summary.average, Decimal("4.50"))
+
+    def test_zero_grades_are_not_counted(self):
+        student = self.students[1]
+        self.set_grades({(student, self.exam): 3})
+        self.set_grades({(student, self.exam): 0})
+        self.assertSummariesMatchGrades()
+        summary = StudentSemesterSummary.objects.get(
+            student=student, semester=self.semester1
+        )
+        self.assertEqual(summary.grade_count, 0)
+        self.assertIsNone(summary.average)
+
+    def test_student_deletion_removes_summaries(self):
+        student = self.students[2]
+        self.set_grades({(student, self.exam): 5, (student, self.second_exam): 4})
+        student.delete()
+        self.assertFalse(StudentSemesterSummary.objects.filter(student_id=student.id))
+        self.assertSummariesMatchGrades()
+
+    def test_discipline_deletion_refreshes_and_prunes(self):
+        student = self.students[3]
+        self.set_grades(
+            {
+                (student, self.exam): 5,
+                (student, self.credit): 2,
+                (student, self.second_exam): 3,
+            }
+        )
+        self.credit.delete()
+        self.assertSummariesMatchGrades()
+        summary = StudentSemesterSummary.objects.get(
+            student=student, semester=self.semester1
+        )
+        self.assertEqual((summary.grade_count, summary.debt_count), (1, 0))
+
+        # Единственная дисциплина семестра: итог без ведомостей удаляется
+        self.second_exam.delete()
+        self.assertFalse(
+            StudentSemesterSummary.objects.filter(semester=self.semester2).exists()
+        )
+        self.assertSummariesMatchGrades()
+
+    def test_rebuild_command_restores_summaries(self):
+        student = self.students[4]
+        self.set_grades({(student, self.exam): 4})
+        StudentSemesterSummary.objects.filter(student=student).update(
+            grade_count=7, grade_sum=1, debt_count=3
+        )
+        StudentSemesterSummary.objects.create(
+            student=self.students[0], semester=self.semester2, grade_count=1
+        )
+        GradeSheet.objects.filter(
+            student=self.students[0], semester=self.semester2
+        ).delete()
+        call_command("rebuild_grade_summaries", stdout=StringIO())
+        self.assertSummariesMatchGrades()
+
+
+class GradeValidationTests(EducationTestCase):
+    def form_data(self, discipline, grades):
+        return {
+            f"grade_{self.sheet(student, discipline).id}": value
+            for student, value in grades
+        }
+
+    def test_exam_rejects_values_outside_the_scale(self):
+        for value in ["1", "6", "-2", "abc", ""]:
+            with self.subTest(value=value):
+                data = self.form_data(self.exam, [(self.students[0], value)])
+                changed, errors = collect_changed_grades(self.exam, self.group, data)
+                self.assertEqual(changed, {})
+                self.assertEqual(errors, [self.sheet(self.students[0], self.exam).id])
+
+    def test_exam_accepts_the_full_scale(self):
+        for value in [2, 3, 4, 5]:
+            with self.subTest(value=value):
+                data = self.form_data(self.exam, [(self.students[0], str(value))])
+                changed, errors = collect_changed_grades(self.exam, self.group, data)
+                self.assertEqual(errors, [])
+                self.assertEqual(
+                    changed, {self.sheet(self.students[0], self.exam).id: value}
+                )
+
+    def test_credit_accepts_pass_and_fail_only(self):
+        passed, failed, rejected = self.students[0], self.students[1], self.students[2]
+        data = self.form_data(
+            self.credit, [(passed, "5"), (failed, "2"), (rejected, "4")]
+        )
+        changed, errors = collect_changed_grades(self.credit, self.group, data)
+        self.assertEqual(
+            changed,
+            {
+                self.sheet(passed, self.credit).id: 5,
+                self.sheet(failed, self.credit).id: 2,
+            },
+        )
+        self.assertEqual(errors, [self.sheet(rejected, self.credit).id])
+
+    def test_unchanged_and_missing_grades_are_skipped(self):
+        self.set_grades({(self.students[0], self.exam): 4})
+        data = self.form_data(self.exam, [(self.students[0], "4")])
+        data["grade_0"] = "5"
+        self.assertEqual(collect_changed_grades(self.exam, self.group, data), ({}, []))
+
+
+class GradeSheetMaterializationTests(EducationTestCase):
+    def test_new_discipline_gets_a_sheet_per_student(self):
+        discipline = Discipline.objects.create(
+            name="Химия", specialty=self.specialty, semester=self.semester2
+        )
+        sheets = GradeSheet.objects.filter(discipline=discipline)
+        self.assertEqual(
+            sorted(sheets.values_list("student_id", flat=True)),
+            sorted(student.id for student in self.students),
+        )
+        self.assertEqual(
+            set(sheets.values_list("grade", "semester_id")), {(0, self.semester2.id)}
+        )
+
+    def test_ensure_grade_sheets_creates_only_missing_rows(self):
+        self.set_grades({(self.students[0], self.exam): 5})
+        self.sheet(self.students[1], self.exam).delete()
+        self.assertEqual(ensure_grade_sheets(self.exam), 1)
+        self.assertEqual(ensure_grade_sheets(self.exam), 0)
+        self.assertEqual(
+            GradeSheet.objects.filter(discipline=self.exam).count(), len(self.students)
+        )
+        self.assertEqual(self.sheet(self.students[0], self.exam).grade, 5)
+
+    def test_discipline_without_semester_gets_no_sheets(self):
+        discipline = Discipline.objects.create(
+            name="Факультатив", specialty=self.specialty
+        )
+        self.assertEqual(ensure_grade_sheets(discipline), 0)
+        self.assertFalse(GradeSheet.objects.filter(discipline=discipline).exists())
+
+    def test_grade_entry_get_does_not_write(self):
+        self.client.force_login(self.registrar)
+        url = reverse("grade_entry", args=[self.exam.id, self.group.id])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["grades"]), len(self.students))
+        writes = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+        ]
+        self.assertEqual(writes, [])
+
+    def test_semester_change_moves_sheets_and_summaries(self):
+        student = self.students[0]
+        self.set_grades({(student, self.exam): 4, (student, self.second_exam): 2})
+        self.exam.semester = self.semester2
+        self.exam.save()
+        self.assertEqual(
+            set(
+                GradeSheet.objects.filter(discipline=self.exam).values_list(
+                    "semester_id", flat=True
+                )
+            ),
+            {self.semester2.id},
+        )
+        summaries = {
+            summary.semester_id: summary
+            for summary in StudentSemesterSummary.objects.filter(student=student)
+        }
+        # В первом семестре осталась только незаполненная зачётная ведомость
+        self.assertEqual(summaries[self.semester1.id].grade_count, 0)
+        self.assertEqual(
+            (
+                summaries[self.semester2.id].grade_count,
+                summaries[self.semester2.id].debt_count,
+            ),
+            (2, 1),
+        )
+
+        self.credit.semester = self.semester2
+        self.credit.save()
+        self.assertFalse(
+            StudentSemesterSummary.objects.filter(semester=self.semester1).exists()
+        )
+
+
+class TeacherAssignmentTests(EducationTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_group = Group.objects.create(
+            specialty=cls.specialty, name="ИВТ-2", admission_year=2024
+        )
+        other_specialty = Specialty.objects.create(code="01.03.02", name="ПМИ")
+        cls.foreign_group = Group.objects.create(
+            specialty=other_specialty, name="ПМИ-1", admission_year=2024
+        )
+        cls.teacher = Teacher.objects.create(
+            surname="Петров", first_name="Пётр", position="Доцент"
+        )
+        cls.other_teacher = Teacher.objects.create(
+            surname="Сидоров", first_name="Сидор", position="Профессор"
+        )
+
+    def assignments(self):
+        return dict(
+            TeachingAssignment.objects.filter(discipline=self.exam).values_list(
+                "group_id", "teacher_id"
+            )
+        )
+
+    def test_assign_teacher_upserts_one_row_per_group(self):
+        groups = Group.objects.filter(id=self.group.id)
+        self.assertEqual(assign_teacher(self.exam, self.teacher, groups), 1)
+        self.assertEqual(assign_teacher(self.exam, self.other_teacher, groups), 1)
+        self.assertEqual(self.assignments(), {self.group.id: self.other_teacher.id})
+
+    def test_view_assigns_the_whole_specialty(self):
+        assign_teacher(
+            self.exam, self.other_teacher, Group.objects.filter(id=self.group.id)
+        )
+        self.client.force_login(self.registrar)
+        url = reverse("assign_teacher", args=[self.exam.id, self.group.id])
+        response = self.client.post(
+            url, {"teacher": self.teacher.id, "all_groups": "on"}
+        )
+        self.assertRedirects(
+            response, reverse("group_selection_for_discipline", args=[self.exam.id])
+        )
+        self.assertEqual(
+            self.assignments(),
+            {self.group.id: self.teacher.id, self.other_group.id: self.teacher.id},
+        )
+
+    def test_view_assigns_a_single_group(self):
+        self.client.force_login(self.registrar)
+        url = reverse("assign_teacher", args=[self.exam.id, self.other_group.id])
+        self.client.post(url, {"teacher": self.teacher.id})
+        self.assertEqual(self.assignments(), {self.other_group.id: self.teacher.id})
+
+    def test_teacher_cannot_assign(self):
+        user = User.objects.create_user(
+            "teacher", password="pass", role=3, surname="Петров"
+        )
+        self.client.force_login(user)
+        url = reverse("assign_teacher", args=[self.exam.id, self.group.id])
+        response = self.client.post(url, {"teacher": self.teacher.id})
+        self.assertRedirects(response, reverse("main"), fetch_redirect_response=False)
+        self.assertEqual(self.assignments(), {})
+
+
+class RosterImportTests(EducationTestCase):
+    def test_new_student_gets_a_sheet_per_discipline(self):
+        student = Student.objects.create(
+            group=self.group, surname="Новиков", first_name="Илья"
+        )
+        self.assertEqual(
+            set(
+                GradeSheet.objects.filter(student=student).values_list(
+                    "discipline_id", "semester_id", "grade"
+                )
+            ),
+            {
+                (self.exam.id, self.semester1.id, 0),
+                (self.credit.id, self.semester1.id, 0),
+                (self.second_exam.id, self.semester2.id, 0),
+            },
+        )
+
+    def test_import_roster_creates_students_and_sheets(self):
+        students = import_roster(
+            self.group,
+            [("Новиков", "Илья", ""), ("Морозов", "Артём", "Андреевич")],
+        )
+        self.assertEqual(
+            [(s.surname, s.patronymic) for s in students],
+            [("Новиков", ""), ("Морозов", "Андреевич")],
+        )
+        self.assertEqual(GradeSheet.objects.filter(student__in=students).count(), 2 * 3)
+
+    def test_form_parses_lines(self):
+        form = RosterImportForm(
+            {"roster": "Новиков Илья\n\n  Морозов  Артём Андреевич Оглы \n"}
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(
+            form.cleaned_data["roster"],
+            [("Новиков", "Илья", ""), ("Морозов", "Артём", "Андреевич Оглы")],
+        )
+
+    def test_form_rejects_bad_lines(self):
+        long_name = "Я" * (Student._meta.get_field("first_name").max_length + 1)
+        for roster, message in [
+            ("Новиков Илья\nМорозов", "Строка 2: укажите как минимум фамилию и имя."),
+            (f"Новиков {long_name}", "Строка 1: имя длиннее 100 символов."),
+            ("\n \n", "Обязательное поле."),
+        ]:
+            with self.subTest(roster=roster):
+                form = RosterImportForm({"roster": roster})
+                self.assertFalse(form.is_valid())
+                self.assertEqual(form.errors["roster"], [message])
+
+    def test_view_imports_roster(self):
+        self.client.force_login(self.registrar)
+        url = reverse("group_students_list", args=[self.group.id])
+        response = self.client.post(
+            url, {"import_roster": "1", "roster": "Новиков Илья\nМорозов Артём"}
+        )
+        self.assertRedirects(response, url)
+        self.assertEqual(Student.objects.filter(group=self.group).count(), 7)
+
+        response = self.client.post(url, {"import_roster": "1", "roster": "Новиков"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Student.objects.filter(group=self.group).count(), 7)
+
+
+class InitDataTests(TestCase):
+    def test_repeated_runs_do_not_duplicate_rows(self):
+        call_command("init_data", stdout=StringIO())
+        counts = [Student.objects.count(), GradeSheet.objects.count()]
+        self.assertGreater(counts[0], 0)
+        self.assertFalse(GradeSheet.objects.filter(grade=0).exists())
+        # Повторный запуск читает каждую таблицу одним запросом, без цикла по строкам
+        with self.assertNumQueries(8):
+            call_command("init_data", stdout=StringIO())
+        self.assertEqual([Student.objects.count(), GradeSheet.objects.count()], counts)
+
+        # Вновь добавленная дисциплина получает ведомости уже зачисленных студентов
+        Discipline.objects.filter(name="Правоведение").delete()
+        call_command("init_data", stdout=StringIO())
+        self.assertEqual([Student.objects.count(), GradeSheet.objects.count()], counts)
+
+        # Сигнал студента остаётся подключённым
+        group = Group.objects.first()
+        student = Student.objects.create(group=group, surname="Новиков", first_name="И")
+        self.assertEqual(
+            GradeSheet.objects.filter(student=student).count(),
+            Discipline.objects.filter(specialty=group.specialty).count(),
+        )
+
+
+class ExplainQueriesTests(EducationTestCase):
+    def test_students_search_plan_uses_the_view_query(self):
+        out = StringIO()
+        call_command("explain_queries", stdout=out)
+        output = out.getvalue()
+        section = output[output.index("students_search_view") :]
+        query = section.splitlines()[1]
+        for column in ["surname", "first_name", "patronymic"]:
+            self.assertIn(f'UPPER("education_student"."{column}"::text)', query)
+        self.assertIn(f"LIMIT {PAGE_SIZE + 1}", query)
+
+
+class StudentAutocompleteTests(EducationTestCase):
+    def setUp(self):
+        self.client.force_login(self.registrar)
+
+    def autocomplete(self, **params):
+        response = self.client.get(reverse("students_autocomplete"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"]
+
+    def test_short_query_returns_nothing(self):
+        self.assertEqual(self.autocomplete(q=" А "), [])
+
+    def test_matches_any_name_field(self):
+        student = Student.objects.create(
+            group=self.group, surname="Морозов", first_name="Артём", patronymic="Ильич"
+        )
+        for query in ["мороз", "АРТ", "ильи", "мор арт"]:
+            with self.subTest(query=query):
+                self.assertEqual(
+                    self.autocomplete(q=query),
+                    [
+                        {
+                            "id": student.id,
+                            "name": "Морозов Артём Ильич",
+                            "group": self.group.name,
+                        }
+                    ],
+                )
+
+    def test_closest_name_comes_first(self):
+        # Фамилия идёт первой по алфавиту, но имя совпадает с запросом хуже
+        partial = Student.objects.create(
+            group=self.group, surname="Абрамов", first_name="Иванна"
+        )
+        results = self.autocomplete(q="Иван")
+        self.assertEqual(len(results), len(self.students) + 1)
+        self.assertEqual(results[-1]["id"], partial.id)
+
+    def test_limit_is_clamped(self):
+        self.assertEqual(len(self.autocomplete(q="Иван", limit=2)), 2)
+        self.assertEqual(len(self.autocomplete(q="Иван", limit=0)), 1)
+        self.assertEqual(len(self.autocomplete(q="Иван", limit="x")), 5)
+
+
+class GradeExportTests(EducationTestCase):
+    def setUp(self):
+        self.client.force_login(self.registrar)
+
+    def test_export_streams_csv(self):
+        self.set_grades({(self.students[0], self.exam): 4})
+        response = self.client.get(
+            reverse("export_grades"), {"group_id": self.group.id}
+        )
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response["Content-Disposition"], 'attachment; filename="grades.csv"'
+        )
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "\ufeff" + ";".join(EXPORT_HEADER))
+        self.assertEqual(len(lines), 1 + len(self.students) * 3)
+        sheet = self.sheet(self.students[0], self.exam)
+        self.assertIn(
+            f"1;09.03.01;ИВТ-1;Алексеев;Иван;;Математика;Экзамен;;4;{sheet.date}",
+            lines,
+        )
+
+    def test_export_filters(self):
+        response = self.client.get(
+            reverse("export_grades"),
+            {"discipline_id": self.second_exam.id, "semester_from": 2},
+        )
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1 + len(self.students))
+        self.assertTrue(all(";Физика;" in line for line in lines[1:]))
+
+        response = self.client.get(reverse("export_grades"), {"group_id": "x"})
+        self.assertEqual(response.status_code, 400)
+
+
+class AsyncGradeExportTests(TransactionTestCase):
+    # Выгрузка под ASGI читает строки в отдельном потоке со своим соединением,
+    # поэтому данные должны быть зафиксированы, а не в транзакции теста
+    def setUp(self):
+        semester = Semester.objects.create(number=1)
+        specialty = Specialty.objects.create(code="09.03.01", name="ИВТ")
+        self.group = Group.objects.create(
+            specialty=specialty, name="ИВТ-1", admission_year=2024
+        )
+        for surname in ["Алексеев", "Борисов", "Васильев"]:
+            Student.objects.create(group=self.group, surname=surname, first_name="Иван")
+        for name in ["Математика", "Физика"]:
+            Discipline.objects.create(name=name, specialty=specialty, semester=semester)
+        self.registrar = User.objects.create_user(
+            "registrar", password="pass", role=1, surname="Регистратор"
+        )
+
+    async def test_export_is_streamed_in_chunks(self):
+        await self.async_client.aforce_login(self.registrar)
+        with mock.patch("education.exports.EXPORT_CHUNK_SIZE", 2):
+            response = await self.async_client.get(
+                reverse("export_grades"), {"group_id": self.group.id}
+            )
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+        # BOM, заголовок и 6 строк порциями по две
+        self.assertEqual(len(chunks), 4)
+        lines = b"".join(chunks).decode().splitlines()
+        self.assertEqual(lines[0], "\ufeff" + ";".join(EXPORT_HEADER))
+        self.assertEqual(len(lines), 1 + 3 * 2)
+        self.assertEqual(
+            [line.split(";")[3] for line in lines[1::2]],
+            ["Алексеев", "Борисов", "Васильев"],
+        )
+
+
+class DocumentCacheTests(EducationTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def curriculum_names(self):
+        return {
+            spec["code"]: [discipline["name"] for discipline in spec["disciplines"]]
+            for spec in curriculum_data()
+        }
+
+    def test_second_read_is_served_from_cache(self):
+        self.curriculum_names()
+        with CaptureQueriesContext(connection) as queries:
+            self.curriculum_names()
+        # Только агрегаты отметки изменения, без чтения дисциплин
+        self.assertEqual(len(queries), 3)
+        self.assertTrue(all("MAX(" in query["sql"] for query in queries))
+
+    def test_writes_change_the_document(self):
+        self.assertEqual(
+            sorted(self.curriculum_names()["09.03.01"]),
+            ["Математика", "Физика", "Физкультура"],
+        )
+        self.exam.name = "Высшая математика"
+        self.exam.save()
+        self.assertIn("Высшая математика", self.curriculum_names()["09.03.01"])
+
+        self.credit.delete()
+        self.assertNotIn("Физкультура", self.curriculum_names()["09.03.01"])
+
+        Specialty.objects.create(code="01.03.02", name="ПМИ")
+        self.assertEqual(self.curriculum_names()["01.03.02"], [])
+
+    def test_control_forms_follow_semester_changes(self):
+        self.assertEqual(
+            control_forms_data(1),
+            {
+                "09.03.01 ИВТ": {
+                    "exams": ["Математика"],
+                    "tests": ["Физкультура"],
+                    "course_works": [],
+                }
+            },
+        )
+        self.second_exam.semester = self.semester1
+        self.second_exam.save()
+        self.assertEqual(
+            control_forms_data(1)["09.03.01 ИВТ"]["exams"], ["Математика", "Физика"]
+        )
+        self.assertEqual(control_forms_data(2), {})
+
+    def test_key_does_not_depend_on_process_state(self):
+        # Другой процесс видит ту же отметку в базе и тот же ключ кеша
+        stamp = documents_modified()
+        build = mock.Mock(return_value=["документ"])
+        self.assertEqual(cached_document("test", build, stamp), ["документ"])
+        self.assertEqual(cached_document("test", build), ["документ"])
+        build.assert_called_once()
+
+
+class ExamTypeTests(EducationTestCase):
+    def test_unknown_exam_type_is_rejected_by_the_database(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Discipline.objects.create(name="Практика", exam_type="Практика")
+
+    def test_every_exam_type_has_a_control_form_column(self):
+        self.assertEqual(set(Discipline.CONTROL_FORM_GROUPS), set(ExamType.values))
+        for exam_type in [ExamType.GRADED_CREDIT, ExamType.COURSE_PROJECT]:
+            Discipline.objects.create(
+                name=exam_type.label,
+                exam_type=exam_type,
+                specialty=self.specialty,
+                semester=self.semester2,
+            )
+        self.assertEqual(
+            control_forms_data(2),
+            {
+                "09.03.01 ИВТ": {
+                    "exams": ["Физика"],
+                    "tests": ["Дифф. зачёт"],
+                    "course_works": ["Курсовой проект"],
+                }
+            },
+        )
+
+
+class MigrationTestCase(TransactionTestCase):
+    migrate_from = None
+
+    def migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.migrate([("education", target)])
+        return executor.loader.project_state(("education", target)).apps
+
+    def setUp(self):
+        self.apps = self.migrate(self.migrate_from)
+
+    def tearDown(self):
+        # Данные теста не должны мешать возврату схемы к последней миграции
+        call_command("flush", verbosity=0, interactive=False)
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+
+class ExamTypeMigrationTests(MigrationTestCase):
+    migrate_from = "0013_studentsemestersummary"
+    migrate_to = "0014_normalize_discipline_exam_type"
+
+    def create_disciplines(self, *exam_types):
+        Discipline = self.apps.get_model("education", "Discipline")
+        for exam_type in exam_types:
+            Discipline.objects.create(name=exam_type, exam_type=exam_type)
+
+    def test_known_variants_are_normalized(self):
+        variants = {
+            "экзамен": "Экзамен",
+            "Зачет": "Зачёт",
+            " зачёт ": "Зачёт",
+            "Дифф.зачет": "Дифф. зачёт",
+            "дифференцированный зачёт": "Дифф. зачёт",
+            "Курсовая": "Курсовая работа",
+            "курсовой  проект": "Курсовой проект",
+        }
+        self.create_disciplines(*variants)
+        apps = self.migrate(self.migrate_to)
+        Discipline = apps.get_model("education", "Discipline")
+        self.assertEqual(
+            dict(Discipline.objects.values_list("name", "exam_type")), variants
+        )
+
+    def test_unknown_exam_type_stops_the_migration(self):
+        self.create_disciplines("Зачет", "Практика")
+        with self.assertRaisesMessage(ValueError, "'Практика'"):
+            self.migrate(self.migrate_to)
+        Discipline = self.apps.get_model("education", "Discipline")
+        self.assertEqual(
+            sorted(Discipline.objects.values_list("exam_type", flat=True)),
+            ["Зачет", "Практика"],
+        )
+
+
+class DbPoolStatsTests(EducationTestCase):
+    def test_staff_users_are_forbidden(self):
+        teacher = User.objects.create_user(
+            "teacher", password="pass", role=3, is_staff=True
+        )
+        for user in [self.registrar, teacher]:
+            with self.subTest(user=user.username):
+                self.client.force_login(user)
+                response = self.client.get(reverse("db_pool_stats"))
+                self.assertEqual(response.status_code, 403)
+
+    def test_superuser_gets_the_stats(self):
+        admin = User.objects.create_superuser("admin", password="pass")
+        self.client.force_login(admin)
+        response = self.client.get(reverse("db_pool_stats"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("server", response.json())
+
+
+@override_settings(AUTH_USER_CACHE_TIMEOUT=300)
+class AuthUserCacheTests(EducationTestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.registrar)
+        self.backend = CachedModelBackend()
+        self.backend.get_user(self.registrar.pk)
+
+    def assertCached(self, cached=True):
+        self.assertEqual(
+            cache.get(user_cache_key(self.registrar.pk)) is not None, cached
+        )
+
+    def test_user_is_read_from_the_cache(self):
+        self.assertCached()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.backend.get_user(self.registrar.pk), self.registrar)
+
+    def test_logout_drops_the_cached_user(self):
+        self.client.post(reverse("logout"))
+        self.assertCached(False)
+
+    def test_password_change_drops_the_cached_user(self):
+        response = self.client.post(
+            reverse("password_change"),
+            {
+                "old_password": "pass",
+                "new_password1": "Ne5kolko-slov",
+                "new_password2": "Ne5kolko-slov",
+            },
+        )
+        self.assertRedirects(
+            response, reverse("password_change_done"), fetch_redirect_response=False
+        )
+        self.assertCached(False)
+        self.assertTrue(
+            self.backend.get_user(self.registrar.pk).check_password("Ne5kolko-slov")
+        )
+
+    def test_role_change_drops_the_cached_user(self):
+        user = User.objects.get(pk=self.registrar.pk)
+        user.role = 3
+        user.save()
+        self.assertCached(False)
+        self.assertEqual(self.backend.get_user(self.registrar.pk).role, 3)
+
+
+class TeachingAssignmentMigrationTests(MigrationTestCase):
+    migrate_from = "0015_teacher_user"
+    migrate_to = "0016_teachingassignment"
+
+    def test_assignment_takes_the_majority_teacher_of_the_group(self):
+        get_model = self.apps.get_model
+        specialty = get_model("education", "Specialty").objects.create(
+            code="09.03.01", name="ИВТ"
+        )
+        semester = get_model("education", "Semester").objects.create(number=1)
+        discipline, untaught = [
+            get_model("education", "Discipline").objects.create(
+                name=name, specialty=specialty, semester=semester
+            )
+            for name in ["Математика", "Физика"]
+        ]
+        first, second = [
+            get_model("education", "Teacher").objects.create(
+                surname=surname, first_name="Иван"
+            )
+            for surname in ["Петров", "Сидоров"]
+        ]
+        Group = get_model("education", "Group")
+        group, other_group = [
+            Group.objects.create(specialty=specialty, name=name, admission_year=2024)
+            for name in ["ИВТ-1", "ИВТ-2"]
+        ]
+        teachers = {group: [second, first, second], other_group: [first]}
+        for group_, group_teachers in teachers.items():
+            for teacher in group_teachers:
+                student = get_model("education", "Student").objects.create(
+                    group=group_, surname="Алексеев", first_name="Иван"
+                )
+                for discipline_, teacher_ in [(discipline, teacher), (untaught, None)]:
+                    get_model("education", "GradeSheet").objects.create(
+                        student=student,
+                        discipline=discipline_,
+                        semester=semester,
+                        teacher=teacher_,
+                        grade=0,
+                        date=date.today(),
+                    )
+
+        apps = self.migrate(self.migrate_to)
+        TeachingAssignment = apps.get_model("education", "TeachingAssignment")
+        self.assertEqual(
+            set(
+                TeachingAssignment.objects.values_list(
+                    "discipline_id", "group_id", "teacher_id"
+                )
+            ),
+            {
+                (discipline.id, group.id, second.id),
+                (discipline.id, other_group.id, first.id),
+            },
+        )
+
+        # Откат возвращает ведомостям преподавателя из назначения
+        apps = self.migrate(self.migrate_from)
+        GradeSheet = apps.get_model("education", "GradeSheet")
+        self.assertEqual(
+            set(
+                GradeSheet.objects.filter(discipline_id=discipline.id).values_list(
+                    "student__group_id", "teacher_id"
+                )
+            ),
+            {(group.id, second.id), (other_group.id, first.id)},
+        )
+        self.assertFalse(
+            GradeSheet.objects.filter(
+                discipline_id=untaught.id, teacher__isnull=False
+            ).exists()
+        )
+
+
+class ReportGenerationTests(TransactionTestCase):
+    # Карточки рендерятся в дочерних процессах со своими соединениями,
+    # поэтому данные должны быть зафиксированы
+    def setUp(self):
+        semesters = [Semester.objects.create(number=i) for i in range(1, 4)]
+        specialty = Specialty.objects.create(code="09.03.01", name="ИВТ")
+        self.group = Group.objects.create(
+            specialty=specialty, name="ИВТ-1", admission_year=2024
+        )
+        self.students = [
+            Student.objects.create(group=self.group, surname=surname, first_name="Иван")
+            for surname in ["Алексеев", "Борисов", "Васильев"]
+        ]
+        for name, semester in [
+            ("Математика", semesters[0]),
+            ("Физика", semesters[1]),
+            ("Химия", semesters[2]),
+        ]:
+            Discipline.objects.create(name=name, specialty=specialty, semester=semester)
+        GradeSheet.objects.filter(student=self.students[0]).update(grade=5)
+        GradeSheet.objects.filter(
+            student=self.students[0], discipline__name="Физика"
+        ).update(grade=2)
+        self.registrar = User.objects.create_user(
+            "registrar", password="pass", role=1, surname="Регистратор"
+        )
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+
+    def test_card_is_written_per_student_and_course(self):
+        progress = []
+        paths = generate_reports(
+            report_students(group_id=self.group.id),
+            self.output_dir,
+            courses=[1, 2],
+            workers=2,
+            chunk_size=2,
+            progress=lambda done, total: progress.append((done, total)),
+        )
+        self.assertEqual(
+            paths,
+            sorted(
+                os.path.join(self.output_dir, report_filename(student, course))
+                for student in self.students
+                for course in [1, 2]
+            ),
+        )
+        # Прогресс сообщается по завершении каждой пачки
+        self.assertEqual(len(progress), 2)
+        self.assertEqual(progress[-1], (3, 3))
+
+        with open(paths[0], encoding="utf-8") as fh:
+            html = fh.read()
+        self.assertIn("Алексеев Иван", html)
+        self.assertIn("Математика", html)
+        self.assertIn("Физика", html)
+        self.assertNotIn("Химия", html)
+        self.assertIn("3,50", html)
+        self.assertNotIn("navbar", html)
+
+        archive_path = archive_reports(
+            paths, self.output_dir, os.path.join(self.output_dir, "reports.zip")
+        )
+        with zipfile.ZipFile(archive_path) as archive:
+            self.assertEqual(
+                archive.namelist(),
+                [os.path.relpath(path, self.output_dir) for path in paths],
+            )
+
+    def test_batch_reports_view_builds_the_archive(self):
+        self.client.force_login(self.registrar)
+        with override_settings(JOB_RESULTS_DIR=self.output_dir):
+            response = self.client.post(
+                reverse("batch_reports"), {"group_id": self.group.id, "course": 1}
+            )
+        job = Job.objects.get(kind=Job.BATCH_REPORTS)
+        self.assertRedirects(
+            response,
+            reverse("job_status", args=[job.id]),
+            fetch_redirect_response=False,
+        )
+        self.assertEqual(job.status, Job.DONE)
+        with zipfile.ZipFile(os.path.join(self.output_dir, job.result["file"])) as zf:
+            self.assertEqual(
+                zf.namelist(),
+                sorted(report_filename(student, 1) for student in self.students),
+            )
+
+    def test_batch_reports_view_validates_parameters(self):
+        self.client.force_login(self.registrar)
+        url = reverse("batch_reports")
+        self.assertEqual(self.client.post(url).status_code, 400)
+        self.assertEqual(
+            self.client.post(url, {"group_id": self.group.id, "course": 5}).status_code,
+            400,
+        )
+        teacher = User.objects.create_user("teacher", password="pass", role=3)
+        self.client.force_login(teacher)
+        self.assertEqual(
+            self.client.post(url, {"group_id": self.group.id}).status_code, 403
+        )
+        self.assertFalse(Job.objects.filter(kind=Job.BATCH_REPORTS).exists())
+
+
+@override_settings(BACKGROUND_JOBS=True)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.calls = []
+        patcher = mock.patch.dict(HANDLERS, {Job.EXPORT_GRADES: self.handler})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def handler(self, job, **params):
+        self.calls.append(job.attempts)
+        if params.get("fail"):
+            raise RuntimeError("сбой")
+        return {"ok": True}
+
+    def test_claim_takes_the_earliest_due_job_and_leases_it(self):
+        later = submit(Job.EXPORT_GRADES)
+        first = submit(Job.EXPORT_GRADES)
+        Job.objects.filter(id=first.id).update(
+            run_after=timezone.now() - timedelta(minutes=1)
+        )
+        Job.objects.create(
+            kind=Job.EXPORT_GRADES, run_after=timezone.now() + timedelta(minutes=1)
+        )
+
+        before = timezone.now()
+        job = claim_job()
+        self.assertEqual(job.id, first.id)
+        self.assertEqual((job.status, job.attempts), (Job.RUNNING, 1))
+        self.assertGreaterEqual(job.run_after, before + Job.LEASE)
+
+        self.assertEqual(claim_job().id, later.id)
+        # Остальные задачи либо арендованы, либо ещё не наступили
+        self.assertIsNone(claim_job())
+
+    def test_progress_renews_the_lease(self):
+        submit(Job.EXPORT_GRADES)
+        job = claim_job()
+        Job.objects.filter(id=job.id).update(run_after=timezone.now())
+        job.set_progress(1, 2)
+        self.assertIsNone(claim_job())
+        job.refresh_from_db()
+        self.assertEqual((job.progress, job.total), (1, 2))
+        self.assertGreater(job.run_after, timezone.now() + Job.LEASE / 2)
+
+    def test_expired_lease_is_claimed_again(self):
+        submit(Job.EXPORT_GRADES)
+        job = claim_job()
+        Job.objects.filter(id=job.id).update(run_after=timezone.now())
+        job = claim_job()
+        self.assertEqual((job.status, job.attempts), (Job.RUNNING, 2))
+
+    def test_failed_attempt_is_retried_after_a_delay(self):
+        submit(Job.EXPORT_GRADES, fail=True)
+        before = timezone.now()
+        job = run_job(claim_job())
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertIn("RuntimeError: сбой", job.error)
+        self.assertGreaterEqual(job.run_after, before + JOB_RETRY_DELAY)
+        self.assertIsNone(claim_job())
+
+        Job.objects.filter(id=job.id).update(run_after=timezone.now())
+        job = run_job(claim_job())
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 2))
+        self.assertEqual(self.calls, [1, 2])
+
+    def test_job_fails_after_the_last_attempt(self):
+        job = submit(Job.EXPORT_GRADES, fail=True)
+        for attempt in range(job.max_attempts):
+            Job.objects.filter(id=job.id).update(run_after=timezone.now())
+            job = run_job(claim_job())
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, job.max_attempts))
+        self.assertIsNotNone(job.finished_at)
+        Job.objects.filter(id=job.id).update(run_after=timezone.now())
+        self.assertIsNone(claim_job())
+        self.assertEqual(self.calls, [1, 2, 3])
+
+    def test_lost_worker_on_the_last_attempt_fails_the_job(self):
+        job = submit(Job.EXPORT_GRADES)
+        Job.objects.filter(id=job.id).update(
+            status=Job.RUNNING, attempts=job.max_attempts, run_after=timezone.now()
+        )
+        self.assertIsNone(claim_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn("не завершил", job.error)
+        self.assertEqual(self.calls, [])
+
+
+class InlineJobTests(EducationTestCase):
+    def test_database_error_does_not_abort_the_callers_transaction(self):
+        def broken(job, **params):
+            Discipline.objects.create(name="Практика", exam_type="Практика")
+
+        with (
+            mock.patch.dict(HANDLERS, {Job.ENSURE_GRADE_SHEETS: broken}),
+            transaction.atomic(),
+        ):
+            discipline = Discipline.objects.create(
+                name="Химия", specialty=self.specialty, semester=self.semester1
+            )
+            self.assertEqual(Discipline.objects.filter(name="Химия").count(), 1)
+        job = Job.objects.get(params={"discipline_id": discipline.id})
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn("IntegrityError", job.error)
+        self.assertFalse(Discipline.objects.filter(name="Практика").exists())
+
+
+class KeysetPaginationTests(EducationTestCase):
+    def pages(self, queryset, page_size=2):
+        query = ""
+        while query is not None:
+            page = keyset_paginate(
+                RequestFactory().get(f"/?{query}"), queryset, "surname", page_size
+            )
+            yield page
+            query = page.next_query
+
+    def test_pages_cover_all_rows_in_order(self):
+        queryset = Student.objects.all()
+        pages = list(self.pages(queryset))
+        ids = [student.id for page in pages for student in page]
+        expected = list(queryset.order_by("surname", "id").values_list("id", flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual([len(page.object_list) for page in pages], [2, 2, 1])
+        self.assertTrue(pages[0].is_first)
+        self.assertFalse(any(page.is_first for page in pages[1:]))
+        self.assertFalse(pages[-1].has_next)
+
+    def test_cursor_keeps_other_parameters(self):
+        page = keyset_paginate(
+            RequestFactory().get("/?q=Ал&after=garbage"),
+            Student.objects.all(),
+            "surname",
+            2,
+        )
+        self.assertTrue(page.is_first)
+        self.assertEqual(page.first_query, "q=%D0%90%D0%BB")
+        self.assertIn("q=%D0%90%D0%BB", page.next_query)
+
+    def test_cursor_seeks_the_composite_index(self):
+        queryset = keyset_queryset(Student.objects.all(), "surname", ("Алексеев", 1))
+        with connection.cursor() as cursor:
+            # На пяти строках планировщик иначе выбрал бы полный просмотр
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_bitmapscan = off")
+            plan = queryset[:PAGE_SIZE].explain()
+        # Строки читаются из индекса сразу в нужном порядке, без сортировки
+        self.assertIn("Index Scan using student_surname_id_idx", plan)
+        self.assertIn("Index Cond: (ROW((surname)::text, id) > ROW(", plan)
+        self.assertNotIn("Sort", plan)
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor("Алексеев", 7)), ("Алексеев", 7))
+        for cursor in ["", "garbage", encode_cursor("Алексеев", "x")]:
+            with self.subTest(cursor=cursor):
+                self.assertIsNone(decode_cursor(cursor))
+
+    def test_students_search_continues_after_cursor(self):
+        self.client.force_login(self.registrar)
+        borisov = self.students[2]
+        response = self.client.get(
+            reverse("students_search"),
+            {"after": encode_cursor(borisov.surname, borisov.id)},
+        )
+        self.assertEqual(response.status_code, 200)
+        page = response.context["page"]
+        self.assertEqual(list(page.object_list), [self.students[4]])
+        self.assertFalse(page.is_first)
+        self.assertFalse(page.has_next)
+
+
+class ConditionalResponseTests(EducationTestCase):
+    def setUp(self):
+        self.client.force_login(self.registrar)
+
+    def assertNotModified(self, url):
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        return etag
+
+    def assertModified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_group_grades_api(self):
+        url = reverse("api_group_grades", args=[self.group.id, self.exam.id])
+        etag = self.assertNotModified(url)
+        self.set_grades({(self.students[0], self.exam): 5})
+        self.assertModified(url, etag)
+
+        etag = self.assertNotModified(url)
+        student = self.students[1]
+        student.surname = "Андреев"
+        student.save()
+        self.assertModified(url, etag)
+
+        etag = self.assertNotModified(url)
+        self.students[2].delete()
+        self.assertModified(url, etag)
+
+    def test_student_grades_api(self):
+        url = reverse("api_student_grades", args=[self.students[0].id])
+        etag = self.assertNotModified(url)
+        self.second_exam.name = "Общая физика"
+        self.second_exam.save()
+        self.assertModified(url, etag)
+
+    def test_semester_grades_api(self):
+        url = reverse("api_semester_grades", args=[1]) + f"?group_id={self.group.id}"
+        etag = self.assertNotModified(url)
+        self.set_grades({(self.students[0], self.credit): 2})
+        self.assertModified(url, etag)
+
+        response = self.client.get(
+            reverse("api_semester_grades", args=[1]) + "?group_id=x"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_grades_api_requires_registrar_or_directorate(self):
+        url = reverse("api_group_grades", args=[self.group.id, self.exam.id])
+        etag = self.client.get(url)["ETag"]
+        teacher = User.objects.create_user(
+            "teacher", password="pass", role=3, surname="Преподаватель"
+        )
+        self.client.force_login(teacher)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 403)
+
+    def test_student_report(self):
+        url = reverse("student_report", args=[self.students[0].id]) + "?course=1"
+        # Первый ответ выставляет cookie CSRF, от которого зависит ETag
+        self.client.get(url)
+        etag = self.assertNotModified(url)
+        self.set_grades({(self.students[0], self.exam): 4})
+        self.assertModified(url, etag)
+
+    def test_documents(self):
+        for name in ["curriculum_doc", "control_forms"]:
+            with self.subTest(name=name):
+                url = reverse(name)
+                self.client.get(url)
+                etag = self.assertNotModified(url)
+                self.exam.hours += 1
+                self.exam.save()
+                self.assertModified(url, etag)
+
+                etag = self.assertNotModified(url)
+                self.semester1.save()
+                self.assertModified(url, etag)
+
+    def test_document_etag_changes_with_the_date(self):
+        url = reverse("curriculum_doc")
+        self.client.get(url)
+        etag = self.assertNotModified(url)
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        with mock.patch.object(timezone, "localdate", return_value=tomorrow):
+            self.assertModified(url, etag)
@@ -1,6 +1,10 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import async_views, views
+
+# Под ASGI отчёты и документы обслуживают асинхронные представления
+report_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
     path("", views.main_window, name="main"),
@@ -12,9 +16,16 @@ urlpatterns = [
         name="student_card",
     ),
     path("reports/study-plan/", views.study_plan, name="study_plan"),
-    path("control-forms/", views.control_forms_view, name="control_forms"),
-    path("curriculum-doc/", views.curriculum_doc_view, name="curriculum_doc"),
+    path("control-forms/", report_views.control_forms_view, name="control_forms"),
+    path(
+        "curriculum-doc/", report_views.curriculum_doc_view, name="curriculum_doc"
+    ),
     path("directorate/students/", views.students_search_view, name="students_search"),
+    path(
+        "directorate/students/autocomplete/",
+        views.students_autocomplete_view,
+        name="students_autocomplete",
+    ),
     path(
         "directorate/disciplines/",
         views.discipline_selection_view,
@@ -37,7 +48,7 @@ urlpatterns = [
     ),
     path(
         "directorate/students/<int:student_id>/report/",
-        views.student_report_view,
+        report_views.student_report_view,
         name="student_report",
     ),
     path(
@@ -55,6 +66,29 @@ urlpatterns = [
         views.assign_teacher_view,
         name="assign_teacher",
     ),
+    path("export/grades.csv", views.export_grades_view, name="export_grades"),
+    path("reports/batch/", views.batch_reports_view, name="batch_reports"),
+    path(
+        "api/grades/group/<int:group_id>/discipline/<int:discipline_id>/",
+        views.api_group_grades_view,
+        name="api_group_grades",
+    ),
+    path(
+        "api/grades/student/<int:student_id>/",
+        views.api_student_grades_view,
+        name="api_student_grades",
+    ),
+    path(
+        "api/grades/semester/<int:semester_number>/",
+        views.api_semester_grades_view,
+        name="api_semester_grades",
+    ),
+    path("jobs/", views.jobs_list_view, name="jobs_list"),
+    path("jobs/<int:job_id>/", views.job_status_view, name="job_status"),
+    path(
+        "jobs/<int:job_id>/download/", views.job_download_view, name="job_download"
+    ),
+    path("system/db-pool/", views.db_pool_stats_view, name="db_pool_stats"),
     path("groups/select/", views.group_selection, name="group_selection"),
     path("groups/<int:group_id>/grades/", views.grading_window, name="grading_window"),
 ]
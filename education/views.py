@@ -1,14 +1,71 @@
-from collections import defaultdict
+import hashlib
 from datetime import date
+from functools import wraps
+
+from django.conf import settings
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.contrib.postgres.search import TrigramSimilarity
 from django.core.exceptions import PermissionDenied
-from django.db.models import Avg
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Concat, Greatest
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
-
-from .forms import AssignTeacherForm, StudentForm
-from .models import Discipline, GradeSheet, Group, Semester, Specialty, Student, Teacher
+from django.utils import timezone
+from django.utils.html import format_html_join
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_POST, require_safe
+
+from .api import (
+    group_discipline_grades,
+    group_discipline_stamp,
+    semester_grades,
+    semester_stamp,
+    student_grades,
+    student_stamp,
+)
+from .dbstats import connection_stats
+from .documents import control_forms_data, curriculum_data, documents_modified
+from .exports import astream_csv, export_grade_sheets, stream_csv
+from .forms import AssignTeacherForm, RosterImportForm, StudentForm
+from .jobs import job_result_file, submit, visible_jobs
+from .models import (
+    Discipline,
+    ExamType,
+    GradeSheet,
+    Group,
+    Job,
+    Semester,
+    Specialty,
+    Student,
+    StudentSemesterSummary,
+    Teacher,
+    TeachingAssignment,
+)
+from .pagination import keyset_paginate
+from .reports import REPORT_COURSES
+from .services import (
+    assign_teacher,
+    collect_changed_grades,
+    import_roster,
+    save_grades,
+)
+
+AUTOCOMPLETE_MIN_LENGTH = 2
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 25
+JOBS_LIST_LIMIT = 50
+
+GRADE_LABELS = {5: "5 (Отлично)", 4: "4 (Хорошо)", 3: "3 (Удовл.)", 2: "2 (Неуд.)"}
+PASS_FAIL_LABELS = {5: "Зачтено", 2: "Незачтено"}
 
 
 def is_registrar(user):
@@ -76,8 +133,13 @@ def disciplines_list(request):
         except ValueError:
             hours_val = -1
 
+        valid_exam_type = exam_type in ExamType.values
+
         if "add_discipline" in request.POST:
-            if hours_val <= 0:
+            if not valid_exam_type:
+                messages.error(request, "Ошибка: Неизвестный вид аттестации.")
+
+            elif hours_val <= 0:
                 messages.error(
                     request, "Ошибка: Количество часов должно быть больше нуля."
                 )
@@ -107,7 +169,9 @@ def disciplines_list(request):
         elif "edit_discipline" in request.POST:
             disc = get_object_or_404(Discipline, id=request.POST.get("discipline_id"))
 
-            if hours_val <= 0:
+            if not valid_exam_type:
+                messages.error(request, "Ошибка: Неизвестный вид аттестации.")
+            elif hours_val <= 0:
                 messages.error(
                     request,
                     f"Ошибка обновления: для дисциплины '{disc.name}' указано некорректное время.",
@@ -182,35 +246,25 @@ def assign_teacher_view(request, discipline_id, group_id):
         form = AssignTeacherForm(request.POST)
         if form.is_valid():
             teacher = form.cleaned_data["teacher"]
-            updated_count = GradeSheet.objects.filter(
-                discipline=discipline, student__group=group
-            ).update(teacher=teacher)
-            if updated_count == 0:
-                students = Student.objects.filter(group=group)
-                for student in students:
-                    GradeSheet.objects.update_or_create(
-                        student=student,
-                        discipline=discipline,
-                        semester=discipline.semester,
-                        defaults={"teacher": teacher},
-                    )
-                updated_count = students.count()
+            if form.cleaned_data["all_groups"]:
+                groups = Group.objects.filter(specialty_id=discipline.specialty_id)
+            else:
+                groups = Group.objects.filter(id=group.id)
+            updated_count = assign_teacher(discipline, teacher, groups)
             messages.success(
                 request,
-                f"Преподаватель {teacher.surname} назначен. Обновлено записей: {updated_count}.",
+                f"Преподаватель {teacher.surname} назначен. Групп: {updated_count}.",
             )
             return redirect(
                 "group_selection_for_discipline", discipline_id=discipline.id
             )
     else:
-        current_entry = GradeSheet.objects.filter(
-            discipline=discipline, student__group=group
-        ).first()
-        initial_data = (
-            {"teacher": current_entry.teacher}
-            if current_entry and current_entry.teacher
-            else {}
+        current = (
+            TeachingAssignment.objects.filter(discipline=discipline, group=group)
+            .select_related("teacher")
+            .first()
         )
+        initial_data = {"teacher": current.teacher} if current else {}
         form = AssignTeacherForm(initial=initial_data)
     return render(
         request,
@@ -223,20 +277,34 @@ def assign_teacher_view(request, discipline_id, group_id):
 def group_students_list_view(request, group_id):
     group = get_object_or_404(Group, id=group_id)
     students = Student.objects.filter(group=group).order_by("surname")
+    form = StudentForm()
+    import_form = RosterImportForm()
     if request.method == "POST":
-        form = StudentForm(request.POST)
-        if form.is_valid():
-            student = form.save(commit=False)
-            student.group = group
-            student.save()
-            messages.success(request, f"Студент {student.surname} добавлен.")
-            return redirect("group_students_list", group_id=group.id)
-    else:
-        form = StudentForm()
+        if "import_roster" in request.POST:
+            import_form = RosterImportForm(request.POST)
+            if import_form.is_valid():
+                created = import_roster(group, import_form.cleaned_data["roster"])
+                messages.success(
+                    request, f"Импортировано студентов: {len(created)}."
+                )
+                return redirect("group_students_list", group_id=group.id)
+        else:
+            form = StudentForm(request.POST)
+            if form.is_valid():
+                student = form.save(commit=False)
+                student.group = group
+                student.save()
+                messages.success(request, f"Студент {student.surname} добавлен.")
+                return redirect("group_students_list", group_id=group.id)
     return render(
         request,
         "group_students_list.html",
-        {"group": group, "students": students, "form": form},
+        {
+            "group": group,
+            "students": students,
+            "form": form,
+            "import_form": import_form,
+        },
     )
 
 
@@ -250,94 +318,223 @@ def delete_student_view(request, student_id):
     return redirect("group_students_list", group_id=group_id)
 
 
+def grade_options(discipline):
+    # Готовые списки <option> для каждой оценки: строка ведомости в шаблоне
+    # выводит готовый HTML вместо сравнения оценки с каждым вариантом
+    labels = (
+        PASS_FAIL_LABELS if discipline.exam_type == ExamType.CREDIT else GRADE_LABELS
+    )
+    choices = [(0, "---"), *labels.items()]
+    return {
+        grade: format_html_join(
+            "",
+            '<option value="{}"{}>{}</option>',
+            (
+                (value, " selected" if value == grade else "", label)
+                for value, label in choices
+            ),
+        )
+        for grade in [None, *dict(choices)]
+    }
+
+
 @login_required
 def grade_entry_view(request, discipline_id, group_id):
     discipline = get_object_or_404(Discipline, id=discipline_id)
     group = get_object_or_404(Group, id=group_id)
-    students = Student.objects.filter(group=group)
-    if request.user.role != 2:
-        for student in students:
-            GradeSheet.objects.get_or_create(
-                student=student,
-                discipline=discipline,
-                semester=discipline.semester,
-                defaults={"grade": 0},
-            )
-    grades = GradeSheet.objects.filter(
-        discipline=discipline, student__group=group
-    ).select_related("student")
     if request.method == "POST":
         if request.user.role == 2:
             messages.error(request, "У Дирекции нет прав на изменение оценок.")
             return redirect(
                 "grade_entry", discipline_id=discipline.id, group_id=group.id
             )
-        for grade_obj in grades:
-            new_grade = request.POST.get(f"grade_{grade_obj.id}")
-            if new_grade is not None:
-                grade_obj.grade = new_grade
-                grade_obj.save()
-        messages.success(request, "Оценки сохранены.")
+        changed, errors = collect_changed_grades(discipline, group, request.POST)
+        if errors:
+            messages.error(
+                request,
+                f"Ошибка: некорректные оценки в {len(errors)} строках. Изменения не сохранены.",
+            )
+        else:
+            updated_count = save_grades(changed)
+            messages.success(
+                request, f"Оценки сохранены. Изменено записей: {updated_count}."
+            )
         return redirect("grade_entry", discipline_id=discipline.id, group_id=group.id)
+    grades = (
+        GradeSheet.objects.filter(discipline=discipline, student__group=group)
+        .select_related("student")
+        .order_by("student__surname", "student__first_name")
+    )
+    options = grade_options(discipline)
+    grades = list(grades)
+    for sheet in grades:
+        sheet.options = options.get(sheet.grade, options[None])
     return render(
         request,
         "grade_entry.html",
-        {"discipline": discipline, "group": group, "grades": grades},
+        {
+            "discipline": discipline,
+            "group": group,
+            "grades": grades,
+            "readonly": request.user.role == 2,
+        },
     )
 
 
+def page_stamp(request, stamp_func, *args, **kwargs):
+    # condition вызывает etag_func и last_modified_func по отдельности,
+    # а отметка изменения у них общая: запрос к базе выполняется один раз
+    if not hasattr(request, "page_stamp"):
+        request.page_stamp = stamp_func(request, *args, **kwargs)
+    return request.page_stamp
+
+
+def conditional_page(stamp_func):
+    # stamp_func возвращает (время изменения, версия) или None, если объекта нет.
+    # На странице есть имя пользователя и CSRF-токен формы выхода, поэтому ETag
+    # слабый и зависит от пользователя и секрета CSRF, а ответ помечен private.
+    # Документы печатаются с датой формирования: в начале суток копия устаревает
+    def etag(request, *args, **kwargs):
+        stamp = page_stamp(request, stamp_func, *args, **kwargs)
+        if stamp is None:
+            return None
+        modified, version = stamp
+        csrf_secret = request.COOKIES.get(settings.CSRF_COOKIE_NAME, "")
+        key = (
+            f"{request.user.id}:{csrf_secret}:{timezone.localdate()}:"
+            f"{modified}:{version}"
+        )
+        return f'W/"{hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()}"'
+
+    def last_modified(request, *args, **kwargs):
+        stamp = page_stamp(request, stamp_func, *args, **kwargs)
+        if stamp is None:
+            return None
+        midnight = timezone.localtime().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        return max(stamp[0], midnight) if stamp[0] else midnight
+
+    def decorator(view):
+        view = condition(etag_func=etag, last_modified_func=last_modified)(view)
+        return cache_control(private=True, no_cache=True)(view)
+
+    return decorator
+
+
+def documents_stamp(request, *args, **kwargs):
+    return documents_modified()
+
+
+def control_forms_semester(request):
+    try:
+        return int(request.GET.get("semester", 1))
+    except (ValueError, TypeError):
+        return 1
+
+
 @login_required
+@conditional_page(documents_stamp)
 def control_forms_view(request):
-    semester_num = request.GET.get("semester", 1)
-    disciplines = Discipline.objects.filter(
-        semester__number=semester_num
-    ).select_related("specialty")
-    grouped_data = defaultdict(lambda: {"exams": [], "tests": [], "course_works": []})
-    for d in disciplines:
-        spec_name = f"{d.specialty.code} {d.specialty.name}"
-        if "Экзамен" in d.exam_type:
-            grouped_data[spec_name]["exams"].append(d.name)
-        elif "зачёт" in d.exam_type.lower():
-            grouped_data[spec_name]["tests"].append(d.name)
-        elif "Курсовая" in d.exam_type:
-            grouped_data[spec_name]["course_works"].append(d.name)
+    semester_num = control_forms_semester(request)
     return render(
         request,
         "control_forms_doc.html",
         {
             "semester": semester_num,
-            "grouped_data": dict(grouped_data.items()),
+            "grouped_data": control_forms_data(
+                semester_num, page_stamp(request, documents_stamp)
+            ),
         },
     )
 
 
-@login_required
-def student_report_view(request, student_id):
-    student = get_object_or_404(
-        Student.objects.select_related("group__specialty"), id=student_id
-    )
+def report_course(request):
     try:
         course_num = int(request.GET.get("course", 1))
     except (ValueError, TypeError):
         course_num = 1
     sem_end = course_num * 2
-    sem_start = sem_end - 1
-    grades_queryset = (
+    return course_num, sem_end - 1, sem_end
+
+
+def report_grades(student_id, sem_start, sem_end):
+    return (
         GradeSheet.objects.filter(
-            student=student, semester__number__in=[sem_start, sem_end]
+            student_id=student_id, semester__number__in=[sem_start, sem_end]
         )
         .select_related("discipline", "semester")
         .order_by("semester__number", "discipline__name")
     )
-    average_grade = grades_queryset.aggregate(Avg("grade"))["grade__avg"]
+
+
+def report_totals(student_id, sem_start, sem_end):
+    totals = StudentSemesterSummary.objects.filter(
+        student_id=student_id, semester__number__in=[sem_start, sem_end]
+    ).aggregate(
+        grade_count=Sum("grade_count"),
+        grade_sum=Sum("grade_sum"),
+        debt_count=Sum("debt_count"),
+    )
+    average_grade = (
+        totals["grade_sum"] / totals["grade_count"] if totals["grade_count"] else None
+    )
+    return average_grade, totals["debt_count"] or 0
+
+
+def report_modified(student_id, sem_start, sem_end):
+    # Один запрос: отметки студента, группы и специальности плюс подзапросы
+    # по ведомостям курса и их дисциплинам (индекс по студенту и семестру)
+    sheets = GradeSheet.objects.filter(
+        student_id=OuterRef("id"), semester__number__in=[sem_start, sem_end]
+    ).values("student_id")
+    row = (
+        Student.objects.filter(id=student_id)
+        .annotate(
+            sheets_modified=Subquery(
+                sheets.annotate(
+                    modified=Greatest(Max("updated_at"), Max("discipline__updated_at"))
+                ).values("modified")
+            ),
+            sheet_count=Subquery(sheets.annotate(count=Count("id")).values("count")),
+        )
+        .values_list(
+            "updated_at",
+            "group__updated_at",
+            "group__specialty__updated_at",
+            "sheets_modified",
+            "sheet_count",
+        )
+        .first()
+    )
+    if row is None:
+        return None
+    *stamps, sheet_count = row
+    return max(stamp for stamp in stamps if stamp), str(sheet_count or 0)
+
+
+def report_stamp(request, student_id):
+    _, sem_start, sem_end = report_course(request)
+    return report_modified(student_id, sem_start, sem_end)
+
+
+@login_required
+@conditional_page(report_stamp)
+def student_report_view(request, student_id):
+    student = get_object_or_404(
+        Student.objects.select_related("group__specialty"), id=student_id
+    )
+    course_num, sem_start, sem_end = report_course(request)
+    average_grade, debt_count = report_totals(student.id, sem_start, sem_end)
     return render(
         request,
         "student_report.html",
         {
             "student": student,
             "course": course_num,
-            "grades": grades_queryset,
+            "grades": report_grades(student.id, sem_start, sem_end),
             "average_grade": average_grade,
+            "debt_count": debt_count,
             "sem_start": sem_start,
             "sem_end": sem_end,
             "today": date.today(),
@@ -345,44 +542,105 @@ def student_report_view(request, student_id):
     )
 
 
+def search_students(query):
+    # Каждое слово запроса должно встретиться в фамилии, имени или отчестве;
+    # icontains обслуживается триграммными индексами по UPPER(...)
+    condition = Q()
+    for term in query.split():
+        condition &= (
+            Q(surname__icontains=term)
+            | Q(first_name__icontains=term)
+            | Q(patronymic__icontains=term)
+        )
+    return Student.objects.filter(condition)
+
+
+def students_search_queryset(query):
+    students = search_students(query) if query else Student.objects.all()
+    return students.select_related("group__specialty")
+
+
 @login_required
 def students_search_view(request):
     query = request.GET.get("q", "")
-    if query:
-        students = Student.objects.filter(surname__icontains=query).select_related(
-            "group__specialty"
-        )
-    else:
-        students = (
-            Student.objects.all().select_related("group__specialty").order_by("surname")
-        )
+    page = keyset_paginate(request, students_search_queryset(query), "surname")
     return render(
-        request, "students_search.html", {"students": students, "query": query}
+        request,
+        "students_search.html",
+        {"students": page.object_list, "page": page, "query": query},
+    )
+
+
+@login_required
+def students_autocomplete_view(request):
+    query = request.GET.get("q", "").strip()
+    try:
+        limit = int(request.GET.get("limit", AUTOCOMPLETE_LIMIT))
+    except ValueError:
+        limit = AUTOCOMPLETE_LIMIT
+    limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+    if len(query) < AUTOCOMPLETE_MIN_LENGTH:
+        return JsonResponse({"results": []})
+    full_name = Concat(
+        "surname", Value(" "), "first_name", Value(" "), "patronymic"
+    )
+    results = (
+        search_students(query)
+        .annotate(similarity=TrigramSimilarity(full_name, query))
+        .order_by("-similarity", "surname", "id")
+        .values("id", "surname", "first_name", "patronymic", "group__name")[:limit]
+    )
+    return JsonResponse(
+        {
+            "results": [
+                {
+                    "id": row["id"],
+                    "name": f"{row['surname']} {row['first_name']} {row['patronymic']}".strip(),
+                    "group": row["group__name"],
+                }
+                for row in results
+            ]
+        }
     )
 
 
 @login_required
 def discipline_selection_view(request):
     if request.user.role == 3:
-        teacher_inst = Teacher.objects.filter(surname=request.user.surname).first()
+        teacher_inst = Teacher.objects.filter(user=request.user).first()
         if teacher_inst:
-            discipline_ids = (
-                GradeSheet.objects.filter(teacher=teacher_inst)
-                .values_list("discipline_id", flat=True)
-                .distinct()
+            # Подзапрос читает assignment_teacher_disc_idx; без кеша в процессе,
+            # поэтому новое назначение сразу видно во всех воркерах
+            disciplines = Discipline.objects.filter(
+                id__in=TeachingAssignment.objects.filter(teacher=teacher_inst).values(
+                    "discipline_id"
+                )
             )
-            disciplines = Discipline.objects.filter(id__in=discipline_ids)
         else:
             disciplines = Discipline.objects.none()
     else:
         disciplines = Discipline.objects.all()
-    return render(request, "discipline_selection.html", {"disciplines": disciplines})
+    page = keyset_paginate(
+        request, disciplines.select_related("specialty", "semester"), "name"
+    )
+    return render(
+        request,
+        "discipline_selection.html",
+        {"disciplines": page.object_list, "page": page},
+    )
 
 
 @login_required
 def group_selection_view(request, discipline_id):
     discipline = get_object_or_404(Discipline, id=discipline_id)
-    groups = Group.objects.filter(specialty=discipline.specialty)
+    teachers = TeachingAssignment.objects.filter(
+        discipline=discipline, group=OuterRef("pk")
+    ).values("teacher__surname")
+    groups = (
+        Group.objects.filter(specialty=discipline.specialty)
+        .select_related("specialty")
+        .annotate(teacher_surname=Subquery(teachers[:1]))
+    )
     return render(
         request, "group_selection.html", {"discipline": discipline, "groups": groups}
     )
@@ -429,12 +687,15 @@ def study_plan(request):
 
 
 @login_required
+@conditional_page(documents_stamp)
 def curriculum_doc_view(request):
-    specialties = Specialty.objects.prefetch_related("discipline_set").all()
     return render(
         request,
         "curriculum_doc.html",
-        {"specialties": specialties, "title": "Учебный план ИРНИТУ"},
+        {
+            "specialties": curriculum_data(page_stamp(request, documents_stamp)),
+            "title": "Учебный план ИРНИТУ",
+        },
     )
 
 
@@ -445,3 +706,171 @@ def course_selection_view(request, student_id):
     return render(
         request, "course_selection.html", {"student": student, "courses": courses}
     )
+
+
+def int_params(data, names):
+    # Целочисленные фильтры из GET/POST; ValueError с именем параметра
+    filters = {}
+    for name in names:
+        raw = data.get(name)
+        if not raw:
+            continue
+        try:
+            filters[name] = int(raw)
+        except ValueError:
+            raise ValueError(name)
+    return filters
+
+
+@login_required
+def export_grades_view(request):
+    if not (is_registrar(request.user) or is_directorate(request.user)):
+        raise PermissionDenied
+    data = request.POST if request.method == "POST" else request.GET
+    try:
+        filters = int_params(
+            data,
+            [
+                "group_id",
+                "discipline_id",
+                "specialty_id",
+                "semester_from",
+                "semester_to",
+            ],
+        )
+    except ValueError as error:
+        return HttpResponseBadRequest(f"Некорректное значение параметра {error}.")
+    if request.method == "POST":
+        # Большие выгрузки готовятся в фоне, файл скачивается со страницы задачи
+        job = submit(Job.EXPORT_GRADES, user=request.user, **filters)
+        return redirect("job_status", job_id=job.id)
+    rows = export_grade_sheets(**filters)
+    response = StreamingHttpResponse(
+        astream_csv(rows) if isinstance(request, ASGIRequest) else stream_csv(rows),
+        content_type="text/csv; charset=utf-8",
+    )
+    response["Content-Disposition"] = 'attachment; filename="grades.csv"'
+    return response
+
+
+@login_required
+def db_pool_stats_view(request):
+    # Пул у каждого воркера свой, поэтому статистику отдаёт сам воркер.
+    # is_staff есть у всех системных пользователей, включая преподавателей
+    if not request.user.is_superuser:
+        raise PermissionDenied
+    return JsonResponse(connection_stats())
+
+
+@login_required
+@require_POST
+def batch_reports_view(request):
+    if not (is_registrar(request.user) or is_directorate(request.user)):
+        raise PermissionDenied
+    try:
+        filters = int_params(
+            request.POST, ["group_id", "specialty_id", "admission_year"]
+        )
+    except ValueError as error:
+        return HttpResponseBadRequest(f"Некорректное значение параметра {error}.")
+    if not filters:
+        return HttpResponseBadRequest(
+            "Укажите group_id, specialty_id или admission_year."
+        )
+    courses = request.POST.getlist("course")
+    if not set(courses) <= {str(course) for course in REPORT_COURSES}:
+        return HttpResponseBadRequest("Некорректное значение параметра course.")
+    courses = [int(course) for course in courses]
+    job = submit(Job.BATCH_REPORTS, user=request.user, courses=courses, **filters)
+    return redirect("job_status", job_id=job.id)
+
+
+@login_required
+def jobs_list_view(request):
+    jobs = visible_jobs(request.user).select_related("created_by").order_by("-id")
+    return render(request, "jobs_list.html", {"jobs": jobs[:JOBS_LIST_LIMIT]})
+
+
+@login_required
+def job_status_view(request, job_id):
+    job = get_object_or_404(visible_jobs(request.user), id=job_id)
+    return render(
+        request,
+        "job_status.html",
+        {"job": job, "has_file": job_result_file(job) is not None},
+    )
+
+
+@login_required
+def job_download_view(request, job_id):
+    job = get_object_or_404(visible_jobs(request.user), id=job_id)
+    path = job_result_file(job)
+    if path is None:
+        raise Http404("Результат задачи недоступен")
+    return FileResponse(
+        open(path, "rb"), as_attachment=True, filename=job.result["filename"]
+    )
+
+
+def registrar_or_directorate_required(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not (is_registrar(request.user) or is_directorate(request.user)):
+            raise PermissionDenied
+        return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+def grades_hash(stamp):
+    return hashlib.md5(repr(stamp).encode(), usedforsecurity=False).hexdigest()
+
+
+def grades_etag(stamp_func):
+    # ETag по штампу из базы (см. api.grades_stamp); при совпадении If-None-Match
+    # декоратор condition отвечает 304 после одного агрегатного запроса
+    def etag(request, *args, **kwargs):
+        return grades_hash(stamp_func(*args, **kwargs))
+
+    return etag
+
+
+def semester_grades_etag(request, semester_number):
+    try:
+        filters = int_params(request.GET, ["group_id"])
+    except ValueError:
+        # Ответ 400 формирует само представление
+        return None
+    return grades_hash(semester_stamp(semester_number, **filters))
+
+
+def grades_json(rows):
+    return JsonResponse({"results": rows}, json_dumps_params={"ensure_ascii": False})
+
+
+@login_required
+@registrar_or_directorate_required
+@require_safe
+@condition(etag_func=grades_etag(group_discipline_stamp))
+def api_group_grades_view(request, group_id, discipline_id):
+    return grades_json(group_discipline_grades(group_id, discipline_id))
+
+
+@login_required
+@registrar_or_directorate_required
+@require_safe
+@condition(etag_func=grades_etag(student_stamp))
+def api_student_grades_view(request, student_id):
+    return grades_json(student_grades(student_id))
+
+
+@login_required
+@registrar_or_directorate_required
+@require_safe
+@condition(etag_func=semester_grades_etag)
+def api_semester_grades_view(request, semester_number):
+    try:
+        filters = int_params(request.GET, ["group_id"])
+    except ValueError as error:
+        return HttpResponseBadRequest(f"Некорректное значение параметра {error}.")
+    return grades_json(semester_grades(semester_number, **filters))
@@ -4,17 +4,67 @@ set -e
 echo "Ожидание запуска базы данных"
 sleep 3
 
+# Воркер фоновых задач: миграции и начальные данные готовит контейнер web
+if [ "$SERVER_MODE" = "worker" ]; then
+    echo "Запуск воркера фоновых задач"
+    exec python manage.py run_jobs
+fi
+
 echo "Создание файлов миграций"
 python manage.py makemigrations --noinput
 
 echo "Применение миграций"
 python manage.py migrate --noinput
 
+echo "Создание таблицы кэша"
+python manage.py createcachetable
+
 echo "Настройка администратора"
 python manage.py setup_admin
 
 echo "Заполнение базы моковыми данными"
 python manage.py init_data
 
-echo "Запуск сервера"
-exec python manage.py runserver 0.0.0.0:8000
+# SERVER_MODE: dev (по умолчанию) - runserver, wsgi - gunicorn, asgi - gunicorn + uvicorn,
+# worker - воркер фоновых задач (см. выше)
+SERVER_MODE="${SERVER_MODE:-dev}"
+CPU_COUNT="$(nproc 2>/dev/null || echo 1)"
+WEB_WORKERS="${WEB_WORKERS:-$((CPU_COUNT * 2 + 1))}"
+WEB_THREADS="${WEB_THREADS:-4}"
+WEB_TIMEOUT="${WEB_TIMEOUT:-60}"
+WEB_MAX_REQUESTS="${WEB_MAX_REQUESTS:-1000}"
+WEB_MAX_REQUESTS_JITTER="${WEB_MAX_REQUESTS_JITTER:-100}"
+
+case "$SERVER_MODE" in
+    wsgi)
+        echo "Запуск gunicorn (WSGI): воркеров $WEB_WORKERS, потоков $WEB_THREADS"
+        exec gunicorn core.wsgi:application \
+            --bind 0.0.0.0:8000 \
+            --workers "$WEB_WORKERS" \
+            --threads "$WEB_THREADS" \
+            --worker-class gthread \
+            --preload \
+            --timeout "$WEB_TIMEOUT" \
+            --graceful-timeout 30 \
+            --max-requests "$WEB_MAX_REQUESTS" \
+            --max-requests-jitter "$WEB_MAX_REQUESTS_JITTER" \
+            --access-logfile -
+        ;;
+    asgi)
+        echo "Запуск gunicorn (ASGI, uvicorn): воркеров $WEB_WORKERS"
+        exec gunicorn core.asgi:application \
+            --bind 0.0.0.0:8000 \
+            --workers "$WEB_WORKERS" \
+            --worker-class uvicorn_worker.UvicornWorker \
+            --preload \
+            --timeout "$WEB_TIMEOUT" \
+            --graceful-timeout 30 \
+            --max-requests "$WEB_MAX_REQUESTS" \
+            --max-requests-jitter "$WEB_MAX_REQUESTS_JITTER" \
+            --access-logfile -
+        ;;
+    *)
+        echo "Запуск сервера разработки"
+        exec python manage.py runserver 0.0.0.0:8000
+        ;;
+esac